@@ -7,11 +7,13 @@ from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote, urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
 from cache_manager import CacheManager
-from config import (API_RATE_LIMIT, CIRCUIT_BREAKER, MAX_RETRIES, PUBCHEM_BASE_URL,
-                   PUBMED_BASE_URL, RETRY_DELAY, SERP_API_KEY)
+from config import (API_RATE_LIMIT, CIRCUIT_BREAKER, MAX_RETRIES, MAX_WORKERS,
+                   PUBCHEM_BASE_URL, PUBMED_BASE_URL, RATE_LIMITS, RETRY_DELAY,
+                   SERP_API_KEY)
 from logger import LogManager
 
 
@@ -91,12 +93,20 @@ class APIClient:
         self.circuit_breaker = CircuitBreaker(name)
         self.logger = LogManager().get_logger(f"api_client.{name}")
         self.last_request_time = 0
+        # Keep-alive connections are reused across requests, with room for
+        # one per concurrent DataProcessor worker
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=MAX_WORKERS)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Each API is throttled to its own limit, not the slowest one's
+        self.rate_limit = RATE_LIMITS.get(name, API_RATE_LIMIT)
 
     def _wait_for_rate_limit(self):
         """Wait to respect rate limiting."""
         elapsed = time.time() - self.last_request_time
-        if elapsed < API_RATE_LIMIT:
-            time.sleep(API_RATE_LIMIT - elapsed)
+        if elapsed < self.rate_limit:
+            time.sleep(self.rate_limit - elapsed)
         self.last_request_time = time.time()
 
     def _make_request(
@@ -141,7 +151,7 @@ class APIClient:
             try:
                 self._wait_for_rate_limit()
                 
-                response = requests.request(
+                response = self.session.request(
                     method,
                     url,
                     params=params,
@@ -288,6 +298,52 @@ class PubChemClient(APIClient):
         
         return data
 
+    def get_compounds_by_cids(self, cids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get compound data for many CIDs with one request per data kind.
+        
+        Args:
+            cids: PubChem CIDs
+            
+        Returns:
+            Compound data keyed by CID, in the same form as get_compound_by_cid
+        """
+        if not cids:
+            return {}
+            
+        # The CID list goes in the POST body, so its length isn't limited by
+        # the URL
+        body = {'cid': ','.join(cids)}
+        props_response = self._make_request(
+            'POST',
+            "compound/cid/property/IUPACName,MolecularWeight,InChI,InChIKey,XLogP,TPSA/JSON",
+            data=body
+        )
+        synonyms_response = self._make_request(
+            'POST', "compound/cid/synonyms/JSON", data=body
+        )
+        
+        results = {
+            cid: {'pubchem_url': f"https://pubchem.ncbi.nlm.nih.gov/compound/{cid}"}
+            for cid in cids
+        }
+        
+        # Process properties
+        if props_response and 'PropertyTable' in props_response:
+            for props in props_response['PropertyTable'].get('Properties', []):
+                data = results.get(str(props.get('CID')))
+                if data is not None:
+                    data.update(props)
+                    
+        # Process synonyms
+        if synonyms_response and 'InformationList' in synonyms_response:
+            for info in synonyms_response['InformationList'].get('Information', []):
+                data = results.get(str(info.get('CID')))
+                if data is not None and 'Synonym' in info:
+                    data['synonyms'] = info['Synonym']
+                    
+        return results
+
     def get_compound_properties(
         self,
         cid: str,
@@ -399,7 +455,7 @@ class WebSearchClient(APIClient):
         for name in names:
             count = self.get_search_results_count(name)
             results.append((name, count))
-            time.sleep(API_RATE_LIMIT)  # Respect rate limits
+            time.sleep(self.rate_limit)  # Respect rate limits
             
         return sorted(results, key=lambda x: x[1], reverse=True)
 
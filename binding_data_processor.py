@@ -10,20 +10,62 @@ This module handles:
 
 import os
 import re
+import sys
 import csv
+import gc
 import json
+import logging
+import concurrent.futures
+from collections import Counter
+from dataclasses import asdict
+from functools import lru_cache
 import requests
 from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
 import pandas as pd
 from rdkit import Chem
 from rdkit.Chem import AllChem
 from tqdm import tqdm
 
+from config import MAX_WORKERS
 from logger import LogManager
-from models import CompoundData
+from models import (
+    AssayConditions,
+    CompoundData,
+    CompoundRecord,
+    Kinetics,
+    LigandIdentifiers,
+    LigandReferences,
+)
 from structure_utils import StructureUtils
 from web_enrichment import WebEnrichment
 
+# Patterns used by BindingDataProcessor._clean_name, compiled once
+_RE_CHEMBL_SUFFIX = re.compile(r"::CHEMBL\d+$")
+_RE_PARENTHESES = re.compile(r"\([^)]*\)")
+_RE_STEREO_PREFIX = re.compile(r"[RS]-")
+_RE_STEREO_LABEL = re.compile(r"\b[RS]\b")
+_RE_SPECIAL_CHARS = re.compile(r"[^\w\s\-\+]")
+_RE_SIGN_PREFIX = re.compile(r"^(?:\+\/\-|\+|\-)\s*")
+_RE_SALT_SUFFIX = re.compile(r"\s*(?:hydrochloride|HCl|salt|hydrate|solvate)$", re.I)
+
+# A whole line that is a CAS registry number, for scanning joined synonyms
+_RE_CAS_LINE = re.compile(r"^\d{1,7}-\d{2}-\d$", re.M)
+
+
+@lru_cache(maxsize=100_000)
+def _smiles_to_ids(smiles: str) -> Optional[Tuple[str, str]]:
+    """Get (InChI, InChI Key) for a SMILES, or None if it cannot be parsed."""
+    mol = Chem.MolFromSmiles(smiles)
+    if mol is None:
+        return None
+    return Chem.MolToInchi(mol), Chem.MolToInchiKey(mol)
+
+
+# Progress bars only render on an interactive terminal, and refresh at most
+# once a second there
+TQDM_KWARGS = {"disable": not sys.stderr.isatty(), "mininterval": 1.0}
+
 logger = LogManager().get_logger("binding_data_processor")
 
 
@@ -336,6 +378,54 @@ class BindingDataProcessor:
         "serotonin 1A",
     ]
 
+    # The target patterns are literal names, so lower-case and escape them
+    # and join them into one alternation (longest first, duplicates removed).
+    # Matching is done by pyarrow's re2 engine against lower-cased columns,
+    # which scans each cell in linear time without per-character case folding.
+    TARGET_REGEX = "|".join(
+        re.escape(p)
+        for p in sorted({p.lower() for p in TARGET_PATTERNS}, key=len, reverse=True)
+    )
+
+    # Swiss tools export columns holding numbers
+    SWISS_NUMERIC_COLUMNS = [
+        *(f"predicted_target_{i}_probability" for i in range(1, 6)),
+        "molecular_weight",
+        "logp",
+        "hbd",
+        "hba",
+        "tpsa",
+        "lipinski_violations",
+        "druglikeness_score",
+        *(f"similar_compound_{i}_similarity" for i in range(1, 4)),
+    ]
+
+    # Flattened compound fields that are exported under a different TSV name
+    TSV_COLUMN_MAP = {
+        "identifiers_pubchem_cid": "pubchem_cid",
+        "identifiers_pubchem_sid": "pubchem_sid",
+        "identifiers_pubchem_aid": "pubchem_aid",
+        "identifiers_chembl_id": "chembl_id",
+        "identifiers_chebi_id": "chebi_id",
+        "identifiers_drugbank_id": "drugbank_id",
+        "identifiers_iuphar_id": "iuphar_id",
+        "identifiers_kegg_id": "kegg_id",
+        "identifiers_zinc_id": "zinc_id",
+        "identifiers_pdb_het": "pdb_het",
+        "identifiers_pdb_complexes": "pdb_complexes",
+        "kinetics_kon": "kon",
+        "kinetics_koff": "koff",
+        "assay_conditions_pH": "pH",
+        "assay_conditions_temperature": "temperature",
+        "references_doi": "doi",
+        "references_pmid": "pmid",
+        "references_authors": "authors",
+        "references_institution": "institution",
+        "references_bindingdb_ligand": "bindingdb_ligand_url",
+        "references_bindingdb_target": "bindingdb_target_url",
+        "references_bindingdb_pair": "bindingdb_pair_url",
+    }
+
     # Activity type patterns with more detail
     ACTIVITY_PATTERNS = {
         "superagonist": [
@@ -490,6 +580,7 @@ class BindingDataProcessor:
                     unit="iB",
                     unit_scale=True,
                     desc="Downloading BindingDB data",
+                    **TQDM_KWARGS,
                 )
 
                 with open(zip_path, "wb") as f:
@@ -505,13 +596,10 @@ class BindingDataProcessor:
                 with zipfile.ZipFile(zip_path, "r") as zip_ref:
                     # Get list of files to extract
                     files = zip_ref.namelist()
-                    extract_progress = tqdm(
-                        files, desc="Extracting files", unit="files"
-                    )
-
-                    for file in extract_progress:
+                    for file in tqdm(
+                        files, desc="Extracting files", unit="files", **TQDM_KWARGS
+                    ):
                         zip_ref.extract(file, os.path.dirname(__file__))
-                        extract_progress.set_description(f"Extracted {file}")
 
                 # Remove zip file
                 os.remove(zip_path)
@@ -624,28 +712,26 @@ class BindingDataProcessor:
 
             # Define dtypes for problematic columns
             dtype_dict = {
-                "Ki (nM)": str,
-                "IC50 (nM)": str,
-                "Kd (nM)": str,
-                "EC50 (nM)": str,
-                "kon (M-1-s-1)": str,
-                "koff (s-1)": str,
-                "pH": str,
-                "Temp (C)": str,
-                "PubChem CID": str,
-                "PubChem SID": str,
-                "PubChem AID": str,
-                "ChEBI ID of Ligand": str,
-                "ChEMBL ID of Ligand": str,
-                "DrugBank ID of Ligand": str,
-                "IUPHAR_GRAC ID of Ligand": str,
-                "KEGG ID of Ligand": str,
-                "ZINC ID of Ligand": str,
+                "Ki (nM)": "string[pyarrow]",
+                "IC50 (nM)": "string[pyarrow]",
+                "Kd (nM)": "string[pyarrow]",
+                "EC50 (nM)": "string[pyarrow]",
+                "kon (M-1-s-1)": "string[pyarrow]",
+                "koff (s-1)": "string[pyarrow]",
+                "pH": "string[pyarrow]",
+                "Temp (C)": "string[pyarrow]",
+                "PubChem CID": "string[pyarrow]",
+                "PubChem SID": "string[pyarrow]",
+                "PubChem AID": "string[pyarrow]",
+                "ChEBI ID of Ligand": "string[pyarrow]",
+                "ChEMBL ID of Ligand": "string[pyarrow]",
+                "DrugBank ID of Ligand": "string[pyarrow]",
+                "IUPHAR_GRAC ID of Ligand": "string[pyarrow]",
+                "KEGG ID of Ligand": "string[pyarrow]",
+                "ZINC ID of Ligand": "string[pyarrow]",
             }
 
             # Process chunks with progress bar
-            from tqdm import tqdm
-
             total_chunks = (total_lines + chunk_size - 1) // chunk_size
             chunk_progress = tqdm(
                 pd.read_csv(
@@ -653,6 +739,7 @@ class BindingDataProcessor:
                     sep="\t",
                     usecols=needed_columns,
                     dtype=dtype_dict,
+                    dtype_backend="pyarrow",
                     on_bad_lines="skip",
                     chunksize=chunk_size,
                     low_memory=False,
@@ -660,20 +747,16 @@ class BindingDataProcessor:
                 desc="Reading BindingDB chunks",
                 total=total_chunks,
                 unit="chunks",
+                **TQDM_KWARGS,
             )
 
             for chunk in chunk_progress:
-                chunk_progress.set_description(
-                    f"Reading chunk {len(chunks) + 1}/{total_chunks}"
-                )
                 chunks.append(chunk)
 
             # Combine chunks with progress bar
             self.logger.info(f"Combining {len(chunks)} chunks...")
-            from tqdm import tqdm
-
             concat_progress = tqdm(
-                total=len(chunks), desc="Combining chunks", unit="chunks"
+                total=len(chunks), desc="Combining chunks", unit="chunks", **TQDM_KWARGS
             )
 
             df = pd.concat(chunks, ignore_index=True, copy=False)  # Reduce memory usage
@@ -700,7 +783,7 @@ class BindingDataProcessor:
                     )
                 ).lower()
                 if not any(x in organism for x in ["human", "mouse", "rat", "mammal"]):
-                    self.logger.debug(f"Skipping non-mammalian target: {organism}")
+                    self.logger.debug("Skipping non-mammalian target: %s", organism)
                     continue
 
                 data = {
@@ -822,12 +905,18 @@ class BindingDataProcessor:
             setattr(compound, f"target_{i}_doi", data["doi"])
             setattr(compound, f"target_{i}_pmid", data["pmid"])
 
-    def gather_ligands(self, llm_api_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    def gather_ligands(
+        self, llm_api_key: Optional[str] = None, fresh: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Gather receptor ligands from multiple sources.
 
+        An interrupted run resumes from its checkpoints, including the
+        compounds it had already processed; a completed run starts over.
+
         Args:
             llm_api_key: Optional API key for LLM-powered analysis
+            fresh: Ignore checkpoints of an interrupted run and start over
 
         Returns:
             List of dictionaries containing compound information:
@@ -842,8 +931,9 @@ class BindingDataProcessor:
             - patents: List of relevant patents (if llm_api_key provided)
         """
         try:
-            # Clear any existing checkpoints
-            self.checkpoint_manager.clear_checkpoints()
+            # Keep an interrupted run's checkpoints so it can resume
+            if self.checkpoint_manager.begin_run("gather_ligands", fresh=fresh):
+                self.logger.info("Resuming from checkpoints of an interrupted run")
 
             self.logger.info("Reading BindingDB data with enhanced columns...")
             needed_columns = [
@@ -900,9 +990,16 @@ class BindingDataProcessor:
 
             # Check for BindingDB parsing checkpoint
             df = None
-            if self.checkpoint_manager.is_step_completed("parse_bindingdb"):
+            if self.checkpoint_manager.is_step_completed("find_targets"):
+                # Target matches are checkpointed, so resuming never needs the
+                # full parsed frame
+                self.logger.info("Skipping BindingDB parsing; targets checkpointed")
+            elif self.checkpoint_manager.is_step_completed("parse_bindingdb"):
                 self.logger.info("Loading parsed BindingDB data from checkpoint...")
                 df = self.checkpoint_manager.load_step_data("parse_bindingdb")
+                # Legacy CSV checkpoints lose the Arrow dtypes; restore them so
+                # the target search below can rely on the str accessor
+                df = df.convert_dtypes(dtype_backend="pyarrow")
             else:
                 self.logger.info(
                     "Reading BindingDB TSV file (this may take a few minutes)..."
@@ -917,23 +1014,23 @@ class BindingDataProcessor:
 
                 # Define dtypes for problematic columns
                 dtype_dict = {
-                    "Ki (nM)": str,
-                    "IC50 (nM)": str,
-                    "Kd (nM)": str,
-                    "EC50 (nM)": str,
-                    "kon (M-1-s-1)": str,
-                    "koff (s-1)": str,
-                    "pH": str,
-                    "Temp (C)": str,
-                    "PubChem CID": str,
-                    "PubChem SID": str,
-                    "PubChem AID": str,
-                    "ChEBI ID of Ligand": str,
-                    "ChEMBL ID of Ligand": str,
-                    "DrugBank ID of Ligand": str,
-                    "IUPHAR_GRAC ID of Ligand": str,
-                    "KEGG ID of Ligand": str,
-                    "ZINC ID of Ligand": str,
+                    "Ki (nM)": "string[pyarrow]",
+                    "IC50 (nM)": "string[pyarrow]",
+                    "Kd (nM)": "string[pyarrow]",
+                    "EC50 (nM)": "string[pyarrow]",
+                    "kon (M-1-s-1)": "string[pyarrow]",
+                    "koff (s-1)": "string[pyarrow]",
+                    "pH": "string[pyarrow]",
+                    "Temp (C)": "string[pyarrow]",
+                    "PubChem CID": "string[pyarrow]",
+                    "PubChem SID": "string[pyarrow]",
+                    "PubChem AID": "string[pyarrow]",
+                    "ChEBI ID of Ligand": "string[pyarrow]",
+                    "ChEMBL ID of Ligand": "string[pyarrow]",
+                    "DrugBank ID of Ligand": "string[pyarrow]",
+                    "IUPHAR_GRAC ID of Ligand": "string[pyarrow]",
+                    "KEGG ID of Ligand": "string[pyarrow]",
+                    "ZINC ID of Ligand": "string[pyarrow]",
                 }
 
                 for chunk in pd.read_csv(
@@ -941,6 +1038,7 @@ class BindingDataProcessor:
                     sep="\t",
                     usecols=needed_columns,
                     dtype=dtype_dict,
+                    dtype_backend="pyarrow",
                     on_bad_lines="skip",
                     chunksize=chunk_size,
                     low_memory=False,
@@ -953,6 +1051,7 @@ class BindingDataProcessor:
 
                 self.logger.info(f"Combining {len(chunks)} chunks...")
                 df = pd.concat(chunks, ignore_index=True)
+                del chunks
                 self.logger.info("BindingDB TSV file loaded successfully.")
 
                 # Save parsing checkpoint
@@ -967,32 +1066,11 @@ class BindingDataProcessor:
                 self.logger.info(
                     "Searching for 5-HT2 receptor targets in BindingDB data..."
                 )
-                pattern = "|".join(self.TARGET_PATTERNS)
-
-                # Convert columns to string and handle NaN values
-                self.logger.info("Converting columns to string format...")
-                df["Target Name"] = df["Target Name"].fillna("").astype(str)
-                df["UniProt (SwissProt) Recommended Name of Target Chain"] = (
-                    df["UniProt (SwissProt) Recommended Name of Target Chain"]
-                    .fillna("")
-                    .astype(str)
-                )
-                df["UniProt (SwissProt) Primary ID of Target Chain"] = (
-                    df["UniProt (SwissProt) Primary ID of Target Chain"]
-                    .fillna("")
-                    .astype(str)
-                )
-
-                # Compile regex pattern once
-                import re
-
-                compiled_pattern = re.compile(pattern, re.IGNORECASE)
-
-                # Search in all relevant columns with enhanced progress tracking
-                from tqdm import tqdm
-
+                # Search in all relevant columns with enhanced progress tracking.
+                # Columns are read as string[pyarrow], so nulls are handled by
+                # na=False and each column is lower-cased once and scanned once
+                # by re2 with a case-sensitive literal alternation.
                 self.logger.info("Searching for 5-HT2 patterns in target columns...")
-                total_rows = len(df)
                 matches_mask = pd.Series(False, index=df.index)
 
                 columns = [
@@ -1000,24 +1078,13 @@ class BindingDataProcessor:
                     "UniProt (SwissProt) Recommended Name of Target Chain",
                     "UniProt (SwissProt) Primary ID of Target Chain",
                 ]
-                for col in tqdm(columns, desc="Searching columns", unit="col"):
+                for col in tqdm(
+                    columns, desc="Searching columns", unit="col", **TQDM_KWARGS
+                ):
                     self.logger.info(f"Searching column: {col}")
-                    # Process in chunks with progress bar
-                    chunk_size = 10000
-                    chunks = range(0, total_rows, chunk_size)
-                    with tqdm(
-                        total=total_rows, desc=f"Processing {col}", unit="rows"
-                    ) as pbar:
-                        for i in chunks:
-                            chunk = df[col].iloc[i : i + chunk_size]
-                            # Use vectorized operations where possible
-                            chunk_matches = (
-                                chunk.fillna("")
-                                .astype(str)
-                                .apply(lambda x: bool(compiled_pattern.search(x)))
-                            )
-                            matches_mask.iloc[i : i + chunk_size] |= chunk_matches
-                            pbar.update(len(chunk))
+                    matches_mask |= (
+                        df[col].str.lower().str.contains(self.TARGET_REGEX, na=False)
+                    )
 
                 matches = df[matches_mask]
                 self.logger.info(f"Found {len(matches):,} initial matches in BindingDB")
@@ -1025,50 +1092,63 @@ class BindingDataProcessor:
                 # Save target matches checkpoint
                 self.checkpoint_manager.save_checkpoint("find_targets", matches)
 
+            # matches is a copy, so release the full parsed frame before the
+            # long compound-processing loop instead of at function exit
+            del df
+            gc.collect()
+
             self.logger.info("Filtering matches by organism and structure...")
 
             # Process compounds with enhanced progress tracking
-            from tqdm import tqdm
-
             compounds = []
             seen_inchikeys = set()
-            processed_count = 0
-            compound_groups = list(matches.groupby("BindingDB Ligand Name"))
+            # Group on categorical codes rather than hashing every name string
+            matches = matches.assign(
+                **{
+                    "BindingDB Ligand Name": matches["BindingDB Ligand Name"].astype(
+                        "category"
+                    )
+                }
+            )
+            compound_groups = list(
+                matches.groupby("BindingDB Ligand Name", sort=False, observed=True)
+            )
+
+            # Screen every structure before the web-fetch loop so that invalid
+            # SMILES and non-ligands are dropped without any HTTP calls
+            first_rows = matches.drop_duplicates("BindingDB Ligand Name")
+            ligand_screen = self._screen_ligands(
+                first_rows["Ligand SMILES"].dropna().unique().tolist()
+            )
+            compound_groups = [
+                (name, group)
+                for name, group in compound_groups
+                if self._passes_screen(ligand_screen, group.iloc[0]["Ligand SMILES"])
+            ]
             total_compounds = len(compound_groups)
 
             self.logger.info(f"Processing {total_compounds:,} unique compounds...")
-            progress_bar = tqdm(
-                total=total_compounds, desc="Processing compounds", unit="compounds"
-            )
 
-            # Check for compound processing checkpoint
-            if self.checkpoint_manager.is_step_completed("process_compounds"):
-                self.logger.info("Loading processed compounds from checkpoint...")
-                compounds = self.checkpoint_manager.load_step_data("process_compounds")
-                processed_count = len(compounds)
+            records: List[CompoundRecord] = []
 
-            # Process compounds with progress bar
-            from tqdm import tqdm
+            # Resume from compounds appended by a previous run
+            compounds = self.checkpoint_manager.load_records("process_compounds")
+            if compounds:
+                self.logger.info(
+                    f"Loaded {len(compounds):,} processed compounds from checkpoint"
+                )
+                seen_inchikeys.update(comp["inchi_key"] for comp in compounds)
 
+            # Process compounds with progress bar
             progress_bar = tqdm(
                 compound_groups,
                 desc="Processing compounds",
                 unit="compounds",
                 total=total_compounds,
+                **TQDM_KWARGS,
             )
 
             for name, group in progress_bar:
-                processed_count += 1
-                progress_bar.set_description(f"Processing {name[:30]}...")
-
-                # Save intermediate checkpoint every 100 compounds
-                if processed_count % 100 == 0:
-                    self.checkpoint_manager.save_checkpoint(
-                        "process_compounds",
-                        compounds,
-                        metadata={"processed_count": processed_count},
-                    )
-
                 # Skip if we've seen this compound
                 inchikey = str(group.iloc[0]["Ligand InChI Key"])
                 if pd.notna(inchikey) and inchikey in seen_inchikeys:
@@ -1094,11 +1174,11 @@ class BindingDataProcessor:
                                 modifier = ""
 
                             # Include assay conditions
-                            conditions = {
-                                "pH": row.get("pH", "N/A"),
-                                "temperature": row.get("Temp (C)", "N/A"),
-                                "source": row.get("Curation/DataSource", "N/A"),
-                            }
+                            conditions = AssayConditions(
+                                pH=row.get("pH", "N/A"),
+                                temperature=row.get("Temp (C)", "N/A"),
+                                source=row.get("Curation/DataSource", "N/A"),
+                            )
 
                             affinities.append(
                                 {
@@ -1117,18 +1197,9 @@ class BindingDataProcessor:
                     # Get first row for compound info
                     row = group.iloc[0]
 
-                    # Convert SMILES to mol for structure analysis
-                    mol = None
-                    if pd.notna(row["Ligand SMILES"]):
-                        mol = Chem.MolFromSmiles(str(row["Ligand SMILES"]))
-
-                        # Check if molecule has 5-HT2 ligand-like features
-                        if mol is not None:
-                            is_potential, patterns = (
-                                self.structure_utils.is_potential_ligand(mol)
-                            )
-                            if not is_potential:
-                                continue
+                    # Structure was parsed and screened for ligand-like
+                    # features up front; only passing groups reach this loop
+                    screen = ligand_screen[row["Ligand SMILES"]]
 
                     # Clean compound name for web searches
                     clean_name = self._clean_name(str(name))
@@ -1199,17 +1270,9 @@ class BindingDataProcessor:
                                 )
                                 clean_name = patent_data.get("name", clean_name)
 
-                    self.logger.info(f"Processing compound: {clean_name}")
+                    self.logger.info("Processing compound: %s", clean_name)
 
                     try:
-                        # Get PubChem data
-                        self.logger.info("Fetching PubChem data...")
-                        pubchem_data = self.web_client._get_pubchem_data(
-                            cas=cas_number,
-                            smiles=str(row["Ligand SMILES"]),
-                            inchi=str(row["Ligand InChI"]),
-                        )
-
                         self.logger.info("Creating compound data structure...")
 
                         # Get Swiss tools data if available
@@ -1248,119 +1311,98 @@ class BindingDataProcessor:
                                     "url"
                                 ]
 
-                        compound_data = {
-                            "name": clean_name,
-                            "original_name": str(name),
-                            "smiles": str(row["Ligand SMILES"]),
-                            "inchi": str(row["Ligand InChI"]),
-                            "inchi_key": str(row["Ligand InChI Key"]),
-                            "affinity_type": best_affinity["type"],
-                            "affinity_value": best_affinity["value"],
-                            "affinity_unit": "nM",
-                            "affinity_modifier": best_affinity["modifier"],
-                            "assay_conditions": best_affinity["conditions"],
-                            "activity_type": self._determine_activity_type(
+                        record = CompoundRecord(
+                            name=clean_name,
+                            original_name=str(name),
+                            smiles=str(row["Ligand SMILES"]),
+                            inchi=str(row["Ligand InChI"]),
+                            inchi_key=str(row["Ligand InChI Key"]),
+                            affinity_type=best_affinity["type"],
+                            affinity_value=best_affinity["value"],
+                            affinity_modifier=best_affinity["modifier"],
+                            assay_conditions=best_affinity["conditions"],
+                            activity_type=self._determine_activity_type(
                                 str(row.get("Assay Description", ""))
                             ),
-                            "target": str(row["Target Name"]),
-                            "target_gene": str(
+                            target=str(row["Target Name"]),
+                            target_gene=str(
                                 row.get(
                                     "UniProt (SwissProt) Primary ID of Target Chain",
                                     "N/A",
                                 )
                             ),
-                            "kinetics": {
-                                "kon": str(row.get("kon (M-1-s-1)", "N/A")),
-                                "koff": str(row.get("koff (s-1)", "N/A")),
-                            },
-                            "identifiers": {
-                                "pubchem_cid": str(row["PubChem CID"]),
-                                "pubchem_sid": str(row["PubChem SID"]),
-                                "pubchem_aid": str(row.get("PubChem AID", "N/A")),
-                                "chembl_id": str(row["ChEMBL ID of Ligand"]),
-                                "chebi_id": str(row.get("ChEBI ID of Ligand", "N/A")),
-                                "drugbank_id": str(
+                            kinetics=Kinetics(
+                                kon=str(row.get("kon (M-1-s-1)", "N/A")),
+                                koff=str(row.get("koff (s-1)", "N/A")),
+                            ),
+                            identifiers=LigandIdentifiers(
+                                pubchem_cid=str(row["PubChem CID"]),
+                                pubchem_sid=str(row["PubChem SID"]),
+                                pubchem_aid=str(row.get("PubChem AID", "N/A")),
+                                chembl_id=str(row["ChEMBL ID of Ligand"]),
+                                chebi_id=str(row.get("ChEBI ID of Ligand", "N/A")),
+                                drugbank_id=str(
                                     row.get("DrugBank ID of Ligand", "N/A")
                                 ),
-                                "iuphar_id": str(
+                                iuphar_id=str(
                                     row.get("IUPHAR_GRAC ID of Ligand", "N/A")
                                 ),
-                                "kegg_id": str(row.get("KEGG ID of Ligand", "N/A")),
-                                "zinc_id": str(row.get("ZINC ID of Ligand", "N/A")),
-                                "pdb_het": str(row.get("Ligand HET ID in PDB", "N/A")),
-                                "pdb_complexes": str(
+                                kegg_id=str(row.get("KEGG ID of Ligand", "N/A")),
+                                zinc_id=str(row.get("ZINC ID of Ligand", "N/A")),
+                                pdb_het=str(row.get("Ligand HET ID in PDB", "N/A")),
+                                pdb_complexes=str(
                                     row.get(
                                         "PDB ID(s) for Ligand-Target Complex", "N/A"
                                     )
                                 ).split(","),
-                            },
-                            "references": {
-                                "doi": str(row.get("Article DOI", "N/A")),
-                                "pmid": str(row.get("PMID", "N/A")),
-                                "authors": str(row.get("Authors", "N/A")),
-                                "institution": str(row.get("Institution", "N/A")),
-                                "bindingdb_ligand": str(
+                            ),
+                            references=LigandReferences(
+                                doi=str(row.get("Article DOI", "N/A")),
+                                pmid=str(row.get("PMID", "N/A")),
+                                authors=str(row.get("Authors", "N/A")),
+                                institution=str(row.get("Institution", "N/A")),
+                                bindingdb_ligand=str(
                                     row.get("Link to Ligand in BindingDB", "N/A")
                                 ),
-                                "bindingdb_target": str(
+                                bindingdb_target=str(
                                     row.get("Link to Target in BindingDB", "N/A")
                                 ),
-                                "bindingdb_pair": str(
+                                bindingdb_pair=str(
                                     row.get(
                                         "Link to Ligand-Target Pair in BindingDB", "N/A"
                                     )
                                 ),
-                            },
-                            "cas_number": cas_number,
-                            "patent_number": str(row.get("Patent Number", "N/A")),
-                            "reference_urls": self.web_client.get_reference_urls(
+                            ),
+                            cas_number=cas_number,
+                            patent_number=str(row.get("Patent Number", "N/A")),
+                            reference_urls=self.web_client.get_reference_urls(
                                 clean_name
                             ),
-                            "matching_patterns": patterns if mol is not None else [],
-                            "species": str(
+                            matching_patterns=screen[1],
+                            species=str(
                                 row.get(
                                     "Target Source Organism According to Curator", "N/A"
                                 )
                             ),
-                            "data_source": str(row.get("Curation/DataSource", "N/A")),
-                        }
+                            data_source=str(row.get("Curation/DataSource", "N/A")),
+                        )
 
-                        # Get data from web sources with progress bar
-                        from tqdm import tqdm
-
-                        web_sources = [
-                            (
-                                "common_names",
-                                lambda: self.web_client.get_common_names(
-                                    clean_name,
-                                    chembl_id=chembl_id,
-                                    smiles=str(row["Ligand SMILES"]),
-                                    inchi=str(row["Ligand InChI"]),
-                                ),
-                            ),
-                            (
-                                "legal_status",
-                                lambda: self.web_client.get_legal_status(clean_name),
-                            ),
-                            (
-                                "pharmacology",
-                                lambda: self.web_client.get_pharmacology(clean_name),
-                            ),
+                        # Get data from web sources
+                        common_names = self.web_client.get_common_names(
+                            clean_name,
+                            chembl_id=chembl_id,
+                            smiles=str(row["Ligand SMILES"]),
+                            inchi=str(row["Ligand InChI"]),
+                        )
+                        record.common_names = [
+                            name_data["name"] for name_data in common_names
                         ]
-
-                        web_progress = tqdm(
-                            web_sources, desc="Fetching web data", unit="sources"
+                        record.legal_status = self.web_client.get_legal_status(
+                            clean_name
+                        )
+                        record.pharmacology = self.web_client.get_pharmacology(
+                            clean_name
                         )
-
-                        for source_name, source_func in web_progress:
-                            web_progress.set_description(f"Fetching {source_name}")
-                            if source_name == "common_names":
-                                data = source_func()
-                                compound_data["common_names"] = [
-                                    name["name"] for name in data
-                                ]
-                            else:
-                                compound_data[source_name] = source_func()
 
                         # Add patent information if API key provided
                         if llm_api_key:
@@ -1368,11 +1410,15 @@ class BindingDataProcessor:
                             patent_info = self._search_patents(
                                 clean_name, str(row["Ligand SMILES"]), llm_api_key
                             )
-                            compound_data.update(patent_info)
+                            record.patents = patent_info["patents"]
+                            record.patent_count = patent_info["patent_count"]
 
                         # Add if valid structure
-                        if self._validate_structure(compound_data):
-                            compounds.append(compound_data)
+                        if self._validate_structure(record.smiles):
+                            records.append(record)
+                            self.checkpoint_manager.append_record(
+                                "process_compounds", asdict(record)
+                            )
                             self.logger.info(
                                 f"Successfully processed compound: {clean_name}"
                             )
@@ -1387,6 +1433,9 @@ class BindingDataProcessor:
                         )
                         continue
 
+            self.checkpoint_manager.close_records("process_compounds")
+            compounds.extend(asdict(record) for record in records)
+
             # Add compounds from patents if API key provided
             if llm_api_key:
                 self.logger.info("Searching patents for additional compounds...")
@@ -1564,218 +1613,287 @@ class BindingDataProcessor:
             )
 
             self.logger.info("Step 2/5: Converting data to DataFrame...")
-            # Convert to DataFrame for easier handling
-            df = pd.DataFrame(compounds)
+            # Flatten one level of nesting in a single pass so identifiers,
+            # kinetics, assay conditions and references become plain columns
+            df = pd.json_normalize(compounds, sep="_", max_level=1).rename(
+                columns=self.TSV_COLUMN_MAP
+            )
+            # Project down to the fields the export reads so bulky nested
+            # values (patents, LLM-extracted reference data, ...) are not
+            # carried through the remaining steps
+            nested_columns = [
+                "legal_status_scheduling",
+                "pharmacology_mechanism_of_action",
+                "pharmacology_metabolism",
+                "pharmacology_toxicity",
+            ]
+            source_columns = set(columns) | set(nested_columns)
+            source_columns |= {"common_names", "reference_urls_urls"}
+            df = df.drop(
+                columns=[col for col in df.columns if col not in source_columns]
+            )
+            # Nested fields no compound provided still get an empty column
+            df = df.assign(**{col: None for col in nested_columns if col not in df})
             total_compounds = len(df)
             self.logger.info(f"Found {total_compounds:,} unique compounds")
 
             self.logger.info("Step 3/5: Processing common names...")
-            # Add common names columns with progress
-            for i in range(3):
-                self.logger.info(f"Processing common name column {i + 1}/3...")
-                df[f"common_name_{i + 1}"] = df["common_names"].apply(
-                    lambda x: x[i] if i < len(x) else ""
-                )
-
-            self.logger.info("Step 4/6: Processing additional data columns...")
-            # Add legal status and pharmacology columns with progress bar
-            from tqdm import tqdm
-
-            progress_bar = tqdm(
-                df.iterrows(),
-                total=total_compounds,
-                desc="Processing compound data",
-                unit="compounds",
+            # Pad each names list to three entries and assign all columns at once
+            df[["common_name_1", "common_name_2", "common_name_3"]] = pd.DataFrame(
+                [(names + ["", "", ""])[:3] for names in df["common_names"].tolist()],
+                index=df.index,
             )
 
-            for idx, row in progress_bar:
-                progress_bar.set_description(
-                    f"Processing {row.get('name', '')[:30]}..."
+            self.logger.info("Step 4/6: Processing additional data columns...")
+            # Legal status: explode the normalized scheduling lists into one
+            # entry per row, format them together and join back per compound
+            scheduling = df["legal_status_scheduling"].explode().dropna()
+            if scheduling.empty:
+                df["legal_status"] = ""
+            else:
+                entries = pd.json_normalize(scheduling.tolist()).set_index(
+                    scheduling.index
                 )
-
-                # Legal status
-                df.at[idx, "legal_status"] = (
-                    "; ".join(
-                        f"{s['jurisdiction']}: {s['schedule']}"
-                        for s in row["legal_status"]["scheduling"]
-                    )
-                    if isinstance(row.get("legal_status"), dict)
-                    else ""
+                labels = (
+                    entries["jurisdiction"].astype(str)
+                    + ": "
+                    + entries["schedule"].astype(str)
                 )
-
-                # Pharmacology
-                if isinstance(row.get("pharmacology"), dict):
-                    df.at[idx, "mechanism_of_action"] = "; ".join(
-                        row["pharmacology"].get("mechanism_of_action", [])
-                    )
-                    df.at[idx, "metabolism"] = "; ".join(
-                        row["pharmacology"].get("metabolism", [])
-                    )
-                    df.at[idx, "toxicity"] = "; ".join(
-                        row["pharmacology"].get("toxicity", [])
-                    )
-
-            self.logger.info("Step 5/6: Adding Swiss tools data...")
-            # Add Swiss tools data with progress bar
-            swiss_progress = tqdm(
-                df.iterrows(),
-                total=total_compounds,
-                desc="Processing Swiss tools data",
-                unit="compounds",
-            )
-
-            for idx, row in swiss_progress:
-                swiss_progress.set_description(
-                    f"Processing {row.get('name', '')[:30]}..."
+                df["legal_status"] = (
+                    labels.groupby(level=0)
+                    .agg("; ".join)
+                    .reindex(df.index, fill_value="")
                 )
 
-                # Add target predictions
-                predictions = row.get("swiss_data", {}).get("target_predictions", [])
-                for i, pred in enumerate(predictions[:5], 1):
-                    df.at[idx, f"predicted_target_{i}"] = pred.get("target", "")
-                    df.at[idx, f"predicted_target_{i}_probability"] = pred.get(
-                        "probability", 0.0
-                    )
-                df.at[idx, "target_predictions_url"] = row.get("swiss_data", {}).get(
-                    "target_predictions_url", ""
+            # Pharmacology
+            for field in ["mechanism_of_action", "metabolism", "toxicity"]:
+                df[field] = df[f"pharmacology_{field}"].map(
+                    "; ".join, na_action="ignore"
                 )
 
-                # Add ADME properties
-                adme = row.get("swiss_data", {}).get("adme_properties", {})
-                physchem = adme.get("physicochemical", {})
-                df.at[idx, "molecular_weight"] = physchem.get("mw", "")
-                df.at[idx, "logp"] = physchem.get("logp", "")
-                df.at[idx, "hbd"] = physchem.get("hbd", "")
-                df.at[idx, "hba"] = physchem.get("hba", "")
-                df.at[idx, "tpsa"] = physchem.get("tpsa", "")
-
-                absorption = adme.get("absorption", {})
-                df.at[idx, "gi_absorption"] = absorption.get("gi_absorption", "")
-                df.at[idx, "bbb_permeant"] = absorption.get("bbb_permeant", "")
-                df.at[idx, "pgp_substrate"] = absorption.get("pgp_substrate", "")
-
-                metabolism = adme.get("metabolism", {}).get("cyp_inhibition", {})
-                df.at[idx, "cyp1a2_inhibitor"] = metabolism.get("cyp1a2", "")
-                df.at[idx, "cyp2c19_inhibitor"] = metabolism.get("cyp2c19", "")
-                df.at[idx, "cyp2c9_inhibitor"] = metabolism.get("cyp2c9", "")
-                df.at[idx, "cyp2d6_inhibitor"] = metabolism.get("cyp2d6", "")
-                df.at[idx, "cyp3a4_inhibitor"] = metabolism.get("cyp3a4", "")
-
-                druglike = adme.get("druglikeness", {})
-                df.at[idx, "lipinski_violations"] = druglike.get(
-                    "Lipinski Violations", ""
-                )
-                df.at[idx, "druglikeness_score"] = druglike.get(
-                    "Druglikeness Score", ""
+            self.logger.info("Step 5/6: Adding Swiss tools data...")
+            # Flatten Swiss tools data per record; numeric fields go into
+            # preallocated float32 arrays instead of object columns
+            numeric_columns = {
+                col: np.full(total_compounds, np.nan, dtype=np.float32)
+                for col in self.SWISS_NUMERIC_COLUMNS
+            }
+            swiss_records = []
+            for i, comp in enumerate(
+                tqdm(
+                    compounds,
+                    desc="Processing Swiss tools data",
+                    unit="compounds",
+                    **TQDM_KWARGS,
                 )
+            ):
+                values = self._extract_swiss_columns(comp.get("swiss_data") or {})
+                for col, array in numeric_columns.items():
+                    array[i] = self._to_float(values.pop(col, None))
+                swiss_records.append(values)
 
-                # Add similar compounds
-                similars = row.get("swiss_data", {}).get("similar_compounds", [])
-                for i, sim in enumerate(similars[:3], 1):
-                    df.at[idx, f"similar_compound_{i}"] = sim.get("name", "")
-                    df.at[idx, f"similar_compound_{i}_similarity"] = sim.get(
-                        "similarity", 0.0
-                    )
-                df.at[idx, "similar_compounds_url"] = row.get("swiss_data", {}).get(
-                    "similar_compounds_url", ""
-                )
+            swiss_frame = pd.DataFrame.from_records(
+                swiss_records, index=df.index
+            ).assign(**numeric_columns)
+            df = pd.concat([df, swiss_frame], axis=1)
 
             self.logger.info("Step 6/6: Adding reference URLs...")
-            # Add reference URLs with progress bar
-            from tqdm import tqdm
-
+            # Expand the reference URL dicts into all URL columns in one pass
             url_types = ["chembl", "pubchem", "wikipedia", "psychonaut", "erowid"]
-            url_progress = tqdm(url_types, desc="Processing URL types", unit="type")
-
-            for url_type in url_progress:
-                url_progress.set_description(f"Processing {url_type} URLs")
-                df[f"{url_type}_url"] = df.apply(
-                    lambda row: (
-                        row["reference_urls"].get(f"{url_type}_url", "")
-                        if isinstance(row["reference_urls"], dict)
-                        else ""
-                    ),
-                    axis=1,
-                )
-
-            # Save as TSV
-            df[columns].to_csv(output_path, sep="\t", index=False)
+            url_columns = [f"{url_type}_url" for url_type in url_types]
+            reference_urls = df.get("reference_urls_urls", pd.Series(index=df.index))
+            df[url_columns] = pd.DataFrame(
+                [
+                    urls if isinstance(urls, dict) else {}
+                    for urls in reference_urls.tolist()
+                ],
+                index=df.index,
+                columns=url_columns,
+            ).fillna("")
+
+            # Save as TSV; reindex fills any column no compound provided.
+            # Rows are written in chunks so only one chunk is formatted at
+            # a time
+            output = df.reindex(columns=columns)
+            chunk_size = 50000
+            with open(output_path, "w", newline="") as f:
+                for start in range(0, max(len(output), 1), chunk_size):
+                    output.iloc[start : start + chunk_size].to_csv(
+                        f, sep="\t", index=False, header=start == 0
+                    )
 
             # Log statistics
             self.logger.info(
                 f"Saved {len(compounds)} 5-HT2 receptor ligands to {output_path}"
             )
 
-            # Collect statistics with progress bar
-            from tqdm import tqdm
+            # Statistics are only for the log, so skip them when INFO is off
+            if self.logger.isEnabledFor(logging.INFO):
+                sources = {comp["source"] for comp in compounds if "source" in comp}
+                with_cas = sum(
+                    1 for comp in compounds if comp.get("cas_number", "N/A") != "N/A"
+                )
+                with_patents = sum(1 for comp in compounds if comp.get("patents", []))
+                activity_types = Counter(
+                    comp.get("activity_type", "unknown") for comp in compounds
+                )
+                species_counts = Counter(
+                    comp.get("species", "N/A") for comp in compounds
+                )
 
-            sources = set()
-            with_cas = 0
-            with_patents = 0
-            activity_types = {}
-            species_counts = {}
+                lines = [
+                    f"Data sources used: {', '.join(sources)}",
+                    f"Compounds with CAS numbers: {with_cas}",
+                    f"Compounds with patent data: {with_patents}",
+                    "Activity type distribution:",
+                    *(f"  {k}: {v}" for k, v in activity_types.most_common()),
+                    "Species distribution:",
+                    *(f"  {k}: {v}" for k, v in species_counts.most_common()),
+                ]
+                self.logger.info("\n".join(lines))
+        else:
+            self.logger.warning("No 5-HT2 receptor ligands found")
 
-            stats_progress = tqdm(
-                compounds, desc="Collecting statistics", unit="compounds"
-            )
+    @staticmethod
+    def _to_float(value: Any) -> float:
+        """Convert a value to float, or NaN if it is missing or not numeric."""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
 
-            for comp in stats_progress:
-                stats_progress.set_description(
-                    f"Analyzing {comp.get('name', '')[:30]}..."
-                )
+    @staticmethod
+    def _extract_swiss_columns(swiss_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Flatten Swiss tools data into TSV column values.
 
-                if "source" in comp:
-                    sources.add(comp["source"])
-                if comp.get("cas_number", "N/A") != "N/A":
-                    with_cas += 1
-                if comp.get("patents", []):
-                    with_patents += 1
+        Args:
+            swiss_data: Swiss tools data stored on a compound record
 
-                activity = comp.get("activity_type", "unknown")
-                activity_types[activity] = activity_types.get(activity, 0) + 1
+        Returns:
+            Dictionary mapping TSV column names to values
+        """
+        values = {}
+
+        # Target predictions
+        for i, pred in enumerate(swiss_data.get("target_predictions", [])[:5], 1):
+            values[f"predicted_target_{i}"] = pred.get("target", "")
+            values[f"predicted_target_{i}_probability"] = pred.get("probability", 0.0)
+        values["target_predictions_url"] = swiss_data.get("target_predictions_url", "")
+
+        # ADME properties
+        adme = swiss_data.get("adme_properties", {})
+        physchem = adme.get("physicochemical", {})
+        values["molecular_weight"] = physchem.get("mw", "")
+        values["logp"] = physchem.get("logp", "")
+        values["hbd"] = physchem.get("hbd", "")
+        values["hba"] = physchem.get("hba", "")
+        values["tpsa"] = physchem.get("tpsa", "")
+
+        absorption = adme.get("absorption", {})
+        values["gi_absorption"] = absorption.get("gi_absorption", "")
+        values["bbb_permeant"] = absorption.get("bbb_permeant", "")
+        values["pgp_substrate"] = absorption.get("pgp_substrate", "")
+
+        metabolism = adme.get("metabolism", {}).get("cyp_inhibition", {})
+        values["cyp1a2_inhibitor"] = metabolism.get("cyp1a2", "")
+        values["cyp2c19_inhibitor"] = metabolism.get("cyp2c19", "")
+        values["cyp2c9_inhibitor"] = metabolism.get("cyp2c9", "")
+        values["cyp2d6_inhibitor"] = metabolism.get("cyp2d6", "")
+        values["cyp3a4_inhibitor"] = metabolism.get("cyp3a4", "")
+
+        druglike = adme.get("druglikeness", {})
+        values["lipinski_violations"] = druglike.get("Lipinski Violations", "")
+        values["druglikeness_score"] = druglike.get("Druglikeness Score", "")
+
+        # Similar compounds
+        for i, sim in enumerate(swiss_data.get("similar_compounds", [])[:3], 1):
+            values[f"similar_compound_{i}"] = sim.get("name", "")
+            values[f"similar_compound_{i}_similarity"] = sim.get("similarity", 0.0)
+        values["similar_compounds_url"] = swiss_data.get("similar_compounds_url", "")
+
+        return values
+
+    def _screen_ligands(
+        self, smiles_list: List[str]
+    ) -> Dict[str, Optional[Tuple[bool, List[str]]]]:
+        """
+        Parse SMILES and check for ligand-like features in one batch.
 
-                species = comp.get("species", "N/A")
-                species_counts[species] = species_counts.get(species, 0) + 1
+        Args:
+            smiles_list: Unique SMILES strings to screen
 
-            self.logger.info(
-                f"Data sources used: {', '.join(sources)}\n"
-                f"Compounds with CAS numbers: {with_cas}\n"
-                f"Compounds with patent data: {with_patents}\n"
-                f"Activity type distribution:\n"
-                + "\n".join(f"  {k}: {v}" for k, v in activity_types.items())
-                + "\nSpecies distribution:\n"
-                + "\n".join(f"  {k}: {v}" for k, v in species_counts.items())
-            )
-        else:
-            self.logger.warning("No 5-HT2 receptor ligands found")
+        Returns:
+            Dictionary mapping each SMILES to (is_potential_ligand,
+            matching_patterns), or to None if RDKit cannot parse it
+        """
 
-    def _validate_structure(self, compound: Dict[str, Any]) -> bool:
+        def screen(smiles: str) -> Optional[Tuple[bool, List[str]]]:
+            mol = Chem.MolFromSmiles(str(smiles))
+            if mol is None:
+                return None
+            return self.structure_utils.is_potential_ligand(mol)
+
+        self.logger.info(f"Screening {len(smiles_list):,} structures...")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            return dict(zip(smiles_list, executor.map(screen, smiles_list)))
+
+    @staticmethod
+    def _passes_screen(
+        ligand_screen: Dict[str, Optional[Tuple[bool, List[str]]]], smiles: Any
+    ) -> bool:
+        """Check whether a SMILES survived the ligand screen."""
+        screen = ligand_screen.get(smiles)
+        # Missing or unparseable structures would fail _validate_structure
+        # anyway, so reject them before any web lookups are spent on them
+        return screen is not None and screen[0]
+
+    def _validate_structure(self, smiles: str) -> bool:
         """
         Validate chemical structure using RDKit.
 
         Args:
-            compound: Compound dictionary containing SMILES
+            smiles: SMILES string of the compound
 
         Returns:
             True if structure is valid, False otherwise
         """
-        if not compound.get("smiles"):
+        if not smiles:
+            return False
+
+        try:
+            # MolFromSmiles sanitizes the molecule, so parsing is the check
+            return Chem.MolFromSmiles(str(smiles)) is not None
+        except Exception as e:
+            self.logger.error(f"Error validating structure: {str(e)}")
             return False
 
+    def _embed_3d(self, smiles: str) -> Optional[Chem.Mol]:
+        """
+        Generate an MMFF-optimized 3D conformation for a structure.
+
+        Only for callers that need coordinates; validation does not.
+
+        Args:
+            smiles: SMILES string of the compound
+
+        Returns:
+            RDKit molecule with hydrogens and a 3D conformer, or None
+        """
         try:
-            mol = Chem.MolFromSmiles(str(compound["smiles"]))
+            mol = Chem.MolFromSmiles(str(smiles))
             if mol is None:
-                return False
+                return None
 
-            # Generate 3D conformation
             mol = Chem.AddHs(mol)
-            AllChem.EmbedMolecule(mol, randomSeed=42)
+            if AllChem.EmbedMolecule(mol, randomSeed=42) != 0:
+                return None
             AllChem.MMFFOptimizeMolecule(mol)
 
-            return True
+            return mol
         except Exception as e:
-            self.logger.error(f"Error validating structure: {str(e)}")
-            return False
+            self.logger.error(f"Error embedding structure: {str(e)}")
+            return None
 
     def _clean_name(self, name: str) -> str:
         """
@@ -1788,24 +1906,22 @@ class BindingDataProcessor:
             Cleaned compound name
         """
         # Remove ChEMBL ID
-        name = re.sub(r"::CHEMBL\d+$", "", name)
+        name = _RE_CHEMBL_SUFFIX.sub("", name)
 
         # Remove stereochemistry
-        name = re.sub(r"\([^)]*\)", "", name)
-        name = re.sub(r"[RS]-", "", name)
-        name = re.sub(r"\b[RS]\b", "", name)
+        name = _RE_PARENTHESES.sub("", name)
+        name = _RE_STEREO_PREFIX.sub("", name)
+        name = _RE_STEREO_LABEL.sub("", name)
 
         # Remove special characters but keep some important ones
-        name = re.sub(r"[^\w\s\-\+]", "", name)
+        name = _RE_SPECIAL_CHARS.sub("", name)
 
         # Normalize whitespace
         name = " ".join(name.split())
 
         # Remove common prefixes/suffixes
-        name = re.sub(r"^(?:\+\/\-|\+|\-)\s*", "", name)
-        name = re.sub(
-            r"\s*(?:hydrochloride|HCl|salt|hydrate|solvate)$", "", name, flags=re.I
-        )
+        name = _RE_SIGN_PREFIX.sub("", name)
+        name = _RE_SALT_SUFFIX.sub("", name)
 
         return name
 
@@ -1828,23 +1944,25 @@ class BindingDataProcessor:
                 canonical_smiles = self.structure_utils.standardize_smiles(smiles)
                 if canonical_smiles:
                     url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/smiles/{canonical_smiles}/synonyms/JSON"
-                    response = self.web_client._make_request(url)
+                    response = self.web_client.http.make_request(url)
                     if response:
                         data = response.json()
                         if "InformationList" in data:
                             synonyms = data["InformationList"]["Information"][0][
                                 "Synonym"
                             ]
-                            for syn in synonyms:
-                                # Look for CAS pattern
-                                if re.match(r"^\d{1,7}-\d{2}-\d$", syn):
-                                    return syn
+                            # Look for CAS pattern in one scan over all synonyms
+                            match = _RE_CAS_LINE.search("\n".join(synonyms))
+                            if match:
+                                return match.group()
 
             # Try web search
             search_results = self.web_client.get_common_names(name)
-            for result in search_results:
-                if re.match(r"^\d{1,7}-\d{2}-\d$", result["name"]):
-                    return result["name"]
+            match = _RE_CAS_LINE.search(
+                "\n".join(result["name"] for result in search_results)
+            )
+            if match:
+                return match.group()
 
         except Exception as e:
             self.logger.error(f"Error getting CAS number: {str(e)}")
@@ -1908,6 +2026,7 @@ class BindingDataProcessor:
             List of compound dictionaries
         """
         compounds = []
+        compounds_by_key: Dict[str, Dict[str, Any]] = {}
         try:
             # Search patents
             url = f"https://patents.google.com/api/query?q={search_term}"
@@ -1925,21 +2044,36 @@ class BindingDataProcessor:
                     extracted = self._extract_chemical_info(text, api_key)
 
                     for compound in extracted:
-                        if "smiles" in compound:
-                            # Validate structure
-                            mol = Chem.MolFromSmiles(compound["smiles"])
-                            if mol is not None:
-                                compounds.append(
-                                    {
-                                        "name": compound.get("name", "Unknown"),
-                                        "smiles": compound["smiles"],
-                                        "inchi": Chem.MolToInchi(mol),
-                                        "inchi_key": Chem.MolToInchiKey(mol),
-                                        "source": "Patent",
-                                        "patent_number": result.get("patent_number"),
-                                        "patent_url": f"https://patents.google.com/patent/{result['patent_number']}",
-                                    }
-                                )
+                        if "smiles" not in compound:
+                            continue
+
+                        # Validate structure; InChI generation is cached per
+                        # SMILES, and the InChI Key identifies the structure
+                        ids = _smiles_to_ids(compound["smiles"])
+                        if ids is None:
+                            continue
+
+                        # A structure seen in an earlier patent only gains
+                        # another patent number, once per patent
+                        existing = compounds_by_key.get(ids[1])
+                        if existing is not None:
+                            patent_number = result.get("patent_number")
+                            if patent_number not in existing["patent_numbers"]:
+                                existing["patent_numbers"].append(patent_number)
+                            continue
+
+                        compound_data = {
+                            "name": compound.get("name", "Unknown"),
+                            "smiles": compound["smiles"],
+                            "inchi": ids[0],
+                            "inchi_key": ids[1],
+                            "source": "Patent",
+                            "patent_number": result.get("patent_number"),
+                            "patent_numbers": [result.get("patent_number")],
+                            "patent_url": f"https://patents.google.com/patent/{result['patent_number']}",
+                        }
+                        compounds_by_key[ids[1]] = compound_data
+                        compounds.append(compound_data)
 
         except Exception as e:
             self.logger.error(f"Error extracting compounds from patents: {str(e)}")
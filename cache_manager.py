@@ -1,143 +1,275 @@
 """Cache management for API responses and processed data."""
 
-import json
+import atexit
+import hashlib
+import queue
+import sqlite3
+import threading
 import time
-from pathlib import Path
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+import orjson
 
 from config import CACHE_DIR, CACHE_EXPIRY
 
+# Values memoize() keeps in memory in front of the database
+MEMO_SIZE = 10_000
+
+
+@lru_cache(maxsize=4096)
+def _get_cache_key(key: str) -> str:
+    """Get the stored key for a cache key."""
+    # Use a digest of the key so long keys are stored compactly; unlike
+    # hash(), it is stable across interpreter runs
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
 
 class CacheManager:
     """Manages caching of API responses and processed data."""
 
     def __init__(self):
-        """Initialize cache manager and ensure cache directory exists."""
+        """Initialize cache manager and ensure cache database exists."""
         self.cache_dir = CACHE_DIR
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "cache.db"
+
+        # One connection per thread; sqlite3 connections are not shareable
+        self._local = threading.local()
+
+        conn = self._get_connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, ts REAL, v BLOB)"
+        )
+        conn.commit()
 
-    def _get_cache_path(self, key: str) -> Path:
-        """Get the file path for a cache key."""
-        # Use hash of key to avoid filesystem issues with long/invalid characters
-        safe_key = str(hash(key))
-        return self.cache_dir / f"{safe_key}.json"
+        # Writes are persisted by a background thread; entries still waiting
+        # to be written are served from their serialized form in memory, so
+        # later changes to the caller's data don't leak into the cache
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._write_queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+        # Recently memoized values, least recently used first
+        self._memo: OrderedDict[str, Any] = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+    def _write_loop(self) -> None:
+        """Persist queued cache entries until the process exits."""
+        while True:
+            cache_key, timestamp, blob = self._write_queue.get()
+            try:
+                conn = self._get_connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO kv VALUES (?, ?, ?)",
+                    (cache_key, timestamp, blob)
+                )
+                conn.commit()
+            except Exception as e:
+                # Keep the writer alive, or flush() would wait forever
+                print(f"Cache write error for {cache_key}: {str(e)}")
+            finally:
+                with self._pending_lock:
+                    pending = self._pending.get(cache_key)
+                    if pending is not None and pending['timestamp'] == timestamp:
+                        del self._pending[cache_key]
+                self._write_queue.task_done()
+
+    def flush(self) -> None:
+        """Block until all queued cache writes have been persisted."""
+        self._write_queue.join()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection to the cache database."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
 
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve data from cache if it exists and hasn't expired.
-        
+
         Args:
             key: Unique identifier for the cached data
-            
+
         Returns:
             Cached data if valid, None otherwise
         """
-        cache_path = self._get_cache_path(key)
-        
-        if not cache_path.exists():
-            return None
-            
+        cache_key = _get_cache_key(key)
+
+        with self._pending_lock:
+            pending = self._pending.get(cache_key)
+        if pending is not None:
+            return orjson.loads(pending['blob'])
+
         try:
-            with cache_path.open('r') as f:
-                cached = json.load(f)
-                
+            conn = self._get_connection()
+            row = conn.execute(
+                "SELECT ts, v FROM kv WHERE k = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
+
             # Check if cache has expired
-            if time.time() - cached['timestamp'] > CACHE_EXPIRY:
-                cache_path.unlink()  # Remove expired cache
+            timestamp, blob = row
+            if time.time() - timestamp > CACHE_EXPIRY:
+                conn.execute("DELETE FROM kv WHERE k = ?", (cache_key,))
+                conn.commit()
                 return None
-                
-            return cached['data']
-            
-        except (json.JSONDecodeError, KeyError, OSError) as e:
+
+            return orjson.loads(blob)
+
+        except (orjson.JSONDecodeError, sqlite3.Error) as e:
             print(f"Cache read error for {key}: {str(e)}")
             return None
 
     def set(self, key: str, data: Dict[str, Any]) -> bool:
         """
         Store data in cache with timestamp.
-        
+
         Args:
             key: Unique identifier for the data
             data: Data to cache
-            
+
         Returns:
             True if successful, False otherwise
         """
-        cache_path = self._get_cache_path(key)
-        
+        cache_key = _get_cache_key(key)
+
         try:
-            cache_data = {
-                'timestamp': time.time(),
-                'data': data
-            }
-            
-            with cache_path.open('w') as f:
-                json.dump(cache_data, f)
-                
+            blob = orjson.dumps(
+                data,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+            timestamp = time.time()
+            with self._pending_lock:
+                self._pending[cache_key] = {'timestamp': timestamp, 'blob': blob}
+            self._write_queue.put((cache_key, timestamp, blob))
             return True
-            
-        except (OSError, TypeError) as e:
+
+        except TypeError as e:
             print(f"Cache write error for {key}: {str(e)}")
             return False
 
+    def memoize(self, namespace: str, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Get a value from memory or the cache, computing it on a miss.
+
+        Args:
+            namespace: Kind of value, e.g. the method that produces it
+            key: Identifier of the value within the namespace
+            factory: Computes the value when it isn't cached
+
+        Returns:
+            Memoized, cached or newly computed value
+        """
+        full_key = f"{namespace}:{key}"
+        with self._memo_lock:
+            if full_key in self._memo:
+                self._memo.move_to_end(full_key)
+                return self._memo[full_key]
+
+        cached = self.get(full_key)
+        if cached is not None:
+            value = cached['value']
+        else:
+            value = factory()
+            # An empty result may come from a failed request; don't keep it
+            if not value:
+                return value
+            self.set(full_key, {'value': value})
+
+        with self._memo_lock:
+            self._memo[full_key] = value
+            if len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return value
+
     def invalidate(self, key: str) -> bool:
         """
         Remove item from cache.
-        
+
         Args:
             key: Cache key to invalidate
-            
+
         Returns:
-            True if successful or file didn't exist, False on error
+            True if successful or entry didn't exist, False on error
         """
-        cache_path = self._get_cache_path(key)
-        
+        cache_key = _get_cache_key(key)
+        with self._memo_lock:
+            self._memo.pop(key, None)
+        self.flush()
+
         try:
-            if cache_path.exists():
-                cache_path.unlink()
+            conn = self._get_connection()
+            conn.execute("DELETE FROM kv WHERE k = ?", (cache_key,))
+            conn.commit()
             return True
-            
-        except OSError as e:
+
+        except sqlite3.Error as e:
             print(f"Cache invalidation error for {key}: {str(e)}")
             return False
 
     def clear(self) -> bool:
         """
         Clear all cached data.
-        
+
         Returns:
             True if successful, False on error
         """
+        with self._memo_lock:
+            self._memo.clear()
+        self.flush()
+
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                cache_file.unlink()
+            conn = self._get_connection()
+            conn.execute("DELETE FROM kv")
+            conn.commit()
             return True
-            
-        except OSError as e:
+
+        except sqlite3.Error as e:
             print(f"Cache clear error: {str(e)}")
             return False
 
     def get_cache_size(self) -> int:
         """
         Get total size of cached data in bytes.
-        
+
         Returns:
             Total size of cache in bytes
         """
-        return sum(f.stat().st_size for f in self.cache_dir.glob("*.json"))
+        return self.get_cache_stats()['total_size_bytes']
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
-        
+
+        Counted from the database, so entries written through every
+        CacheManager sharing it are included.
+
         Returns:
             Dictionary containing cache statistics
         """
-        cache_files = list(self.cache_dir.glob("*.json"))
-        
+        self.flush()
+        try:
+            count, size, oldest, newest = self._get_connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(v)), 0), MIN(ts), MAX(ts) FROM kv"
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Cache stats error: {str(e)}")
+            count, size, oldest, newest = 0, 0, None, None
+
         return {
-            'total_entries': len(cache_files),
-            'total_size_bytes': self.get_cache_size(),
-            'oldest_entry': min((f.stat().st_mtime for f in cache_files), default=0),
-            'newest_entry': max((f.stat().st_mtime for f in cache_files), default=0)
+            'total_entries': count,
+            'total_size_bytes': size,
+            'oldest_entry': oldest or 0,
+            'newest_entry': newest or 0
         }
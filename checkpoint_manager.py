@@ -7,18 +7,111 @@ This module handles:
 4. Managing temporary data files
 """
 
+import gc
 import os
-import json
 import pickle
-from typing import Any, Dict, List, Optional, Set
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set
 from datetime import datetime
+import msgspec
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import zstandard
 
 from logger import LogManager
 
 logger = LogManager().get_logger("checkpoint_manager")
 
 
+def _encode_fallback(obj: Any) -> Any:
+    """Encode NumPy values as Python numbers and lists; reject anything else."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Cannot encode {type(obj).__name__} value as msgpack")
+
+
+# Types that come back from a msgpack round trip exactly as they went in
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None), bytes, list, dict})
+
+
+def _is_plain(data: Any) -> bool:
+    """
+    Check whether data is made only of types msgpack stores losslessly.
+    
+    Tuples, sets, dataclasses, Decimals, NumPy values and the like would
+    load back as lists, dicts or strings.
+    """
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        obj_type = type(obj)
+        if obj_type not in _PLAIN_TYPES:
+            return False
+        if obj_type is dict:
+            for key in obj:
+                if type(key) is not str:
+                    return False
+            stack.extend(obj.values())
+        elif obj_type is list:
+            stack.extend(obj)
+    return True
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector for the duration of the block."""
+    # Decoding a large payload allocates many container objects, each of
+    # which can trigger a collection that walks every one created so far
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _unlink_if_present(path: str) -> None:
+    """Delete a file, ignoring one that doesn't exist."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+# Step payloads are zstd-compressed msgpack frames: a 4-byte big-endian
+# length, then the body
+_encoder = msgspec.msgpack.Encoder(enc_hook=_encode_fallback)
+_decoder = msgspec.msgpack.Decoder()
+PAYLOAD_COMPRESSION_LEVEL = 3
+
+# The completed steps index stays readable JSON
+INDEX_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+
+# DataFrames at least this large in memory are saved as uncompressed Arrow
+# IPC and memory-mapped on load rather than decoded from Parquet
+ARROW_IPC_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# Rows per DataFrame chunk when step data is streamed
+STREAM_CHUNK_ROWS = 50_000
+
+# Legacy CSV/TSV checkpoints at least this large are parsed in chunks
+LARGE_CSV_BYTES = 100 * 1024 * 1024
+
+# Concurrent unlinks when clearing checkpoint files
+UNLINK_WORKERS = 8
+
+# Journal commits between rewrites of the completed steps snapshot
+JOURNAL_COMPACT_INTERVAL = 100
+
+
 class CheckpointManager:
     """Manages processing checkpoints and temporary data."""
     
@@ -35,60 +128,280 @@ class CheckpointManager:
         )
         os.makedirs(self.base_dir, exist_ok=True)
         
-        # Track completed steps
+        # Paths are built often, so the directory prefix and fixed file
+        # paths are joined once here
+        self._path_prefix = os.path.join(self.base_dir, '')
+        self._index_path = self._path_prefix + 'completed_steps.json'
+        self._journal_path = self._path_prefix + 'completed_steps.log'
+        
+        # Track completed steps, with a list of them in completion order
+        # that snapshots are written from
         self.completed_steps: Set[str] = set()
+        self._completed_steps_list: List[str] = []
         self.step_data: Dict[str, Any] = {}
+        self.step_metadata: Dict[str, Dict] = {}
+        
+        # Open append-only record files, one per step
+        self._record_files: Dict[str, BinaryIO] = {}
+        self._record_lock = threading.Lock()
         
         # Load existing checkpoints
         self._load_checkpoints()
+        
+        # Completed steps are appended to a journal, which is folded into
+        # the completed_steps.json snapshot every JOURNAL_COMPACT_INTERVAL
+        # commits instead of rewriting the snapshot on every save
+        self._journal_fd = os.open(
+            self._journal_path,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        )
+        self._journal_commits = 0
 
     def _get_checkpoint_path(self, step_name: str) -> str:
         """Get path for checkpoint file."""
-        return os.path.join(
-            self.base_dir,
-            f"{step_name}.checkpoint"
-        )
+        return f"{self._path_prefix}{step_name}.checkpoint"
 
     def _get_data_path(self, step_name: str) -> str:
         """Get path for step data file."""
-        return os.path.join(
-            self.base_dir,
-            f"{step_name}.data"
-        )
+        return f"{self._path_prefix}{step_name}.data"
+
+    def _get_payload_path(self, step_name: str) -> str:
+        """Get path for compressed msgpack-framed step data file."""
+        return f"{self._path_prefix}{step_name}.mpk.zst"
+
+    def _get_parquet_path(self, step_name: str) -> str:
+        """Get path for Parquet step DataFrame file."""
+        return f"{self._path_prefix}{step_name}.parquet"
+
+    def _get_arrow_path(self, step_name: str) -> str:
+        """Get path for Arrow IPC step DataFrame file."""
+        return f"{self._path_prefix}{step_name}.arrow"
+
+    def _get_step_data_paths(self, step_name: str) -> List[str]:
+        """Get every path a step's data may have been saved to."""
+        stem = self._path_prefix + step_name
+        return [
+            f"{stem}.arrow",
+            f"{stem}.parquet",
+            f"{stem}.mpk.zst",
+            f"{stem}.mpk",
+            f"{stem}.data",
+            f"{stem}.csv",
+            f"{stem}.tsv"
+        ]
+
+    @staticmethod
+    def _write_arrow(path: str, df: pd.DataFrame) -> None:
+        """Write a DataFrame to a file in the Arrow IPC file format."""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    @staticmethod
+    def _read_arrow(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Memory-map an Arrow IPC file as a DataFrame."""
+        # Columns without nulls are views into the mapped pages, which the
+        # kernel reads in as they are accessed
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        return table.to_pandas(split_blocks=True)
+
+    @staticmethod
+    def _iter_arrow(path: str, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Yield an Arrow IPC file's record batches as DataFrames."""
+        with pa.memory_map(path, 'r') as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                yield batch.to_pandas()
+
+    @staticmethod
+    def _iter_parquet(path: str, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Yield a Parquet file's rows as DataFrames of STREAM_CHUNK_ROWS rows."""
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=STREAM_CHUNK_ROWS, columns=columns):
+            yield batch.to_pandas()
+
+    @staticmethod
+    def _write_frame(path: str, data: Any) -> None:
+        """Write data to a file as one compressed, length-prefixed msgpack frame."""
+        with _gc_paused():
+            buf = _encoder.encode(data)
+        frame = len(buf).to_bytes(4, 'big') + buf
+        compressor = zstandard.ZstdCompressor(level=PAYLOAD_COMPRESSION_LEVEL)
+        with open(path, 'wb') as f:
+            f.write(compressor.compress(frame))
+
+    @staticmethod
+    def _read_frame(path: str, compressed: bool = True) -> Any:
+        """Read one length-prefixed msgpack frame from a file."""
+        with open(path, 'rb') as f:
+            frame = f.read()
+        if compressed:
+            frame = zstandard.ZstdDecompressor().decompress(frame)
+        size = int.from_bytes(frame[:4], 'big')
+        with _gc_paused():
+            return _decoder.decode(frame[4:4 + size])
+
+    def _get_records_path(self, step_name: str) -> str:
+        """Get path for append-only step records file."""
+        return f"{self._path_prefix}{step_name}.jsonl"
 
     def _load_checkpoints(self) -> None:
-        """Load existing checkpoints."""
+        """Load the completed steps index; step data is loaded on demand."""
         try:
-            checkpoint_file = os.path.join(self.base_dir, 'completed_steps.json')
+            # Start from the last snapshot
+            checkpoint_file = self._index_path
             if os.path.exists(checkpoint_file):
-                with open(checkpoint_file) as f:
-                    checkpoint_data = json.load(f)
-                    self.completed_steps = set(checkpoint_data.get('completed_steps', []))
+                with open(checkpoint_file, 'rb') as f:
+                    checkpoint_data = orjson.loads(f.read())
+                    for step in checkpoint_data.get('completed_steps', []):
+                        self._mark_completed(step)
+                    self.step_metadata = checkpoint_data.get('metadata', {})
+                    
+            # Then replay steps committed since it was written
+            for entry in self._read_journal():
+                self._mark_completed(entry['step'])
+                if entry.get('meta'):
+                    self.step_metadata[entry['step']] = entry['meta']
                     
-                # Load step data
-                for step in self.completed_steps:
-                    data_path = self._get_data_path(step)
-                    if os.path.exists(data_path):
-                        try:
-                            if data_path.endswith('.csv') or data_path.endswith('.tsv'):
-                                self.step_data[step] = pd.read_csv(
-                                    data_path,
-                                    sep='\t' if data_path.endswith('.tsv') else ','
-                                )
-                            else:
-                                with open(data_path, 'rb') as f:
-                                    self.step_data[step] = pickle.load(f)
-                        except Exception as e:
-                            logger.error(f"Error loading data for step {step}: {str(e)}")
-                            
         except Exception as e:
             logger.error(f"Error loading checkpoints: {str(e)}")
 
+    def _mark_completed(self, step_name: str) -> None:
+        """Add a step to the completed steps, if it isn't already there."""
+        if step_name not in self.completed_steps:
+            self.completed_steps.add(step_name)
+            self._completed_steps_list.append(step_name)
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        """Read the entries appended to the completed steps journal."""
+        journal_path = self._journal_path
+        if not os.path.exists(journal_path):
+            return []
+            
+        with open(journal_path, 'rb') as f:
+            buf = f.read()
+        entries = []
+        offset = 0
+        while offset + 4 <= len(buf):
+            size = int.from_bytes(buf[offset:offset + 4], 'big')
+            frame = buf[offset + 4:offset + 4 + size]
+            if len(frame) < size:
+                # A partially written last frame from an interrupted run
+                logger.warning(f"Ignoring truncated entry in {journal_path}")
+                break
+            entries.append(_decoder.decode(frame))
+            offset += 4 + size
+        return entries
+
+    def _append_journal(self, entry: Dict[str, Any]) -> None:
+        """Durably append one length-prefixed msgpack frame to the journal."""
+        buf = _encoder.encode(entry)
+        os.write(self._journal_fd, len(buf).to_bytes(4, 'big') + buf)
+        os.fsync(self._journal_fd)
+
+    def _write_snapshot(self) -> None:
+        """
+        Atomically replace the snapshot with the current index and reset
+        the journal it now covers.
+        """
+        checkpoint_data = {
+            'completed_steps': self._completed_steps_list,
+            'last_updated': datetime.now().isoformat(),
+            'metadata': self.step_metadata
+        }
+        
+        # Write beside the snapshot and rename over it, so a crash leaves
+        # either the old or the new snapshot intact
+        checkpoint_file = self._index_path
+        tmp_file = checkpoint_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(checkpoint_data, option=INDEX_OPTIONS))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, checkpoint_file)
+        
+        os.ftruncate(self._journal_fd, 0)
+        self._journal_commits = 0
+
+    def _read_step_data(
+        self,
+        step_name: str,
+        stream: bool = False,
+        columns: Optional[List[str]] = None
+    ) -> Optional[Any]:
+        """
+        Read a step's data from whichever format it was saved in.
+        
+        Args:
+            step_name: Name of processing step
+            stream: Return DataFrame data as an iterator of chunks
+            columns: Columns to read from DataFrame data (all if None)
+            
+        Returns:
+            Step data, or None if the step saved no data
+        """
+        arrow_path = self._get_arrow_path(step_name)
+        if os.path.exists(arrow_path):
+            if stream:
+                return self._iter_arrow(arrow_path, columns)
+            return self._read_arrow(arrow_path, columns)
+            
+        parquet_path = self._get_parquet_path(step_name)
+        if os.path.exists(parquet_path):
+            if stream:
+                return self._iter_parquet(parquet_path, columns)
+            return pd.read_parquet(parquet_path, engine='pyarrow', columns=columns)
+            
+        payload_path = self._get_payload_path(step_name)
+        if os.path.exists(payload_path):
+            return self._read_frame(payload_path)
+            
+        # Formats written by older runs: uncompressed msgpack frames,
+        # pickled data and CSV/TSV frames
+        legacy_payload_path = self._path_prefix + step_name + '.mpk'
+        if os.path.exists(legacy_payload_path):
+            return self._read_frame(legacy_payload_path, compressed=False)
+            
+        data_path = self._get_data_path(step_name)
+        if os.path.exists(data_path):
+            with open(data_path, 'rb') as f, _gc_paused():
+                return pickle.load(f)
+        for sep, ext in (('\t', '.tsv'), (',', '.csv')):
+            legacy_path = self._path_prefix + step_name + ext
+            if os.path.exists(legacy_path):
+                if stream:
+                    return pd.read_csv(
+                        legacy_path,
+                        sep=sep,
+                        usecols=columns,
+                        chunksize=STREAM_CHUNK_ROWS
+                    )
+                if os.path.getsize(legacy_path) >= LARGE_CSV_BYTES:
+                    # Parse in chunks to bound the parser's working memory
+                    with pd.read_csv(
+                        legacy_path,
+                        sep=sep,
+                        usecols=columns,
+                        chunksize=STREAM_CHUNK_ROWS
+                    ) as reader:
+                        return pd.concat(reader, ignore_index=True)
+                return pd.read_csv(legacy_path, sep=sep, usecols=columns)
+                
+        return None
+
     def save_checkpoint(
         self,
         step_name: str,
         data: Any = None,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        format: Optional[str] = None
     ) -> None:
         """
         Save processing checkpoint.
@@ -97,58 +410,244 @@ class CheckpointManager:
             step_name: Name of processing step
             data: Data to save (optional)
             metadata: Additional metadata (optional)
+            format: 'parquet' or 'arrow' for DataFrame data (optional);
+                chosen from the DataFrame's size if not given
         """
         try:
             # Save step data if provided
             if data is not None:
-                data_path = self._get_data_path(step_name)
                 if isinstance(data, pd.DataFrame):
-                    # Save DataFrame as TSV/CSV
-                    is_tsv = any(col for col in data.columns if '\t' in str(col))
-                    data_path = data_path.replace('.data', '.tsv' if is_tsv else '.csv')
-                    data.to_csv(
-                        data_path,
-                        sep='\t' if is_tsv else ',',
-                        index=False
-                    )
+                    if format is None:
+                        large = data.memory_usage(deep=False).sum() >= ARROW_IPC_THRESHOLD_BYTES
+                        format = 'arrow' if large else 'parquet'
+                    if format == 'arrow':
+                        # Save large DataFrame as Arrow IPC for memory-mapped loads
+                        data_path = self._get_arrow_path(step_name)
+                        self._write_arrow(data_path, data)
+                    elif format == 'parquet':
+                        # Save DataFrame as typed, compressed Parquet
+                        data_path = self._get_parquet_path(step_name)
+                        data.to_parquet(
+                            data_path,
+                            engine='pyarrow',
+                            compression='zstd',
+                            index=False
+                        )
+                    else:
+                        raise ValueError(f"Unknown checkpoint format: {format}")
+                elif _is_plain(data):
+                    # Save plain data as a msgpack frame
+                    data_path = self._get_payload_path(step_name)
+                    self._write_frame(data_path, data)
                 else:
-                    # Save other data types with pickle
+                    # Pickle anything msgpack would not load back unchanged
+                    data_path = self._get_data_path(step_name)
                     with open(data_path, 'wb') as f:
-                        pickle.dump(data, f)
+                        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                        
+                # Loads pick the first format found, so remove older saves
+                # of this step in every other format
+                for stale_path in self._get_step_data_paths(step_name):
+                    if stale_path != data_path:
+                        _unlink_if_present(stale_path)
                         
                 self.step_data[step_name] = data
             
             # Mark step as completed
-            self.completed_steps.add(step_name)
-            
-            # Save checkpoint info
-            checkpoint_data = {
-                'completed_steps': list(self.completed_steps),
-                'last_updated': datetime.now().isoformat(),
-                'metadata': metadata or {}
-            }
-            
-            checkpoint_file = os.path.join(self.base_dir, 'completed_steps.json')
-            with open(checkpoint_file, 'w') as f:
-                json.dump(checkpoint_data, f, indent=2)
+            self._mark_completed(step_name)
+            if metadata:
+                self.step_metadata[step_name] = metadata
+                
+            # Record the commit in the journal
+            self._append_journal({
+                'step': step_name,
+                'ts': datetime.now().isoformat(),
+                'meta': metadata or {}
+            })
+            self._journal_commits += 1
+            if self._journal_commits >= JOURNAL_COMPACT_INTERVAL:
+                self._write_snapshot()
                 
             logger.info(f"Saved checkpoint for step: {step_name}")
             
         except Exception as e:
             logger.error(f"Error saving checkpoint for {step_name}: {str(e)}")
 
-    def load_step_data(self, step_name: str) -> Optional[Any]:
+    def append_record(self, step_name: str, record: Dict[str, Any]) -> None:
+        """
+        Append a single record to a step's JSONL file.
+        
+        Unlike save_checkpoint, this only writes the new record, so
+        checkpointing a growing result list costs O(N) in total.
+        
+        Args:
+            step_name: Name of processing step
+            record: JSON-serializable record to append
+        """
+        try:
+            line = orjson.dumps(
+                record,
+                default=str,
+                option=(
+                    orjson.OPT_SERIALIZE_NUMPY
+                    | orjson.OPT_NON_STR_KEYS
+                    | orjson.OPT_APPEND_NEWLINE
+                )
+            )
+            with self._record_lock:
+                record_file = self._record_files.get(step_name)
+                if record_file is None:
+                    record_file = self._open_records(self._get_records_path(step_name))
+                    self._record_files[step_name] = record_file
+                record_file.write(line)
+                record_file.flush()
+                
+        except Exception as e:
+            logger.error(f"Error appending record for {step_name}: {str(e)}")
+
+    @staticmethod
+    def _open_records(path: str) -> BinaryIO:
+        """
+        Open a records file for appending, first dropping any partially
+        written last line an interrupted run left behind.
+        """
+        record_file = open(path, 'ab+')
+        end = record_file.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 4096)
+            record_file.seek(start)
+            block = record_file.read(pos - start)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos < end:
+            logger.warning(f"Dropping truncated record at the end of {path}")
+            record_file.truncate(pos)
+        return record_file
+
+    def load_records(self, step_name: str) -> List[Dict[str, Any]]:
+        """
+        Load records appended for a step.
+        
+        Args:
+            step_name: Name of processing step
+            
+        Returns:
+            List of records in the order they were appended
+        """
+        records = []
+        records_path = self._get_records_path(step_name)
+        if not os.path.exists(records_path):
+            return records
+            
+        try:
+            with open(records_path, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        # A partially written line from an interrupted run
+                        logger.warning(
+                            f"Ignoring truncated record in {records_path}"
+                        )
+        except Exception as e:
+            logger.error(f"Error loading records for {step_name}: {str(e)}")
+            
+        return records
+
+    def close_records(self, step_name: str) -> None:
+        """
+        Close a step's record file if it is open.
+        
+        Args:
+            step_name: Name of processing step
+        """
+        with self._record_lock:
+            record_file = self._record_files.pop(step_name, None)
+            if record_file is not None:
+                record_file.close()
+
+    @staticmethod
+    def _unlink_all(paths: List[str]) -> None:
+        """Delete files concurrently, ignoring any that don't exist."""
+        # Skipping an exists() check halves the syscalls per file, and
+        # unlinks on separate threads overlap on disk and network filesystems
+        with ThreadPoolExecutor(max_workers=UNLINK_WORKERS) as executor:
+            list(executor.map(_unlink_if_present, paths))
+
+    def load_step_data(
+        self,
+        step_name: str,
+        stream: bool = False,
+        columns: Optional[List[str]] = None
+    ) -> Optional[Any]:
         """
         Load data for a completed step.
         
         Args:
             step_name: Name of processing step
+            stream: Return DataFrame data as an iterator of DataFrame chunks
+                instead of loading it whole
+            columns: Columns to read from DataFrame data (all if None)
             
         Returns:
             Step data if available, None otherwise
         """
-        if step_name in self.completed_steps:
-            return self.step_data.get(step_name)
+        if step_name not in self.completed_steps:
+            return None
+            
+        # Streamed and column-subset reads go to disk and aren't kept
+        if stream or (columns is not None and step_name not in self.step_data):
+            try:
+                return self._read_step_data(step_name, stream=stream, columns=columns)
+            except Exception as e:
+                logger.error(f"Error loading data for step {step_name}: {str(e)}")
+                return None
+                
+        # Read the step's data the first time it is asked for
+        if step_name not in self.step_data:
+            try:
+                data = self._read_step_data(step_name)
+            except Exception as e:
+                logger.error(f"Error loading data for step {step_name}: {str(e)}")
+                return None
+            if data is None:
+                return None
+            self.step_data[step_name] = data
+            
+        data = self.step_data[step_name]
+        if columns is not None and isinstance(data, pd.DataFrame):
+            return data[columns]
+        return data
+
+    def peek_step_metadata(self, step_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Describe a completed step's saved data without loading it.
+        
+        Args:
+            step_name: Name of processing step
+            
+        Returns:
+            Dictionary with the data file's path, format and size plus the
+            step metadata, or None if the step saved no data
+        """
+        if step_name not in self.completed_steps:
+            return None
+            
+        for data_path in self._get_step_data_paths(step_name):
+            if os.path.exists(data_path):
+                return {
+                    'path': data_path,
+                    'format': data_path[len(self._path_prefix) + len(step_name) + 1:],
+                    'size_bytes': os.path.getsize(data_path),
+                    'metadata': self.get_step_metadata(step_name)
+                }
         return None
 
     def is_step_completed(self, step_name: str) -> bool:
@@ -163,6 +662,28 @@ class CheckpointManager:
         """
         return step_name in self.completed_steps
 
+    def begin_run(self, final_step: str, fresh: bool = False) -> bool:
+        """
+        Prepare checkpoints for a new run.
+        
+        Checkpoints of an interrupted run are kept so it resumes where it
+        stopped; a run that reached its final step, or a fresh run, starts
+        over from nothing.
+        
+        Args:
+            final_step: Step the run checkpoints when it completes
+            fresh: Discard any checkpoints, even of an interrupted run
+            
+        Returns:
+            True if the run resumes from existing checkpoints
+        """
+        if fresh or self.is_step_completed(final_step):
+            self.clear_checkpoints()
+            return False
+        return bool(self.completed_steps) or any(
+            name.endswith('.jsonl') for name in os.listdir(self.base_dir)
+        )
+
     def clear_checkpoints(self, steps: Optional[List[str]] = None) -> None:
         """
         Clear checkpoints and temporary data.
@@ -173,36 +694,52 @@ class CheckpointManager:
         try:
             if steps is None:
                 # Clear all checkpoints
-                for step in self.completed_steps:
-                    data_path = self._get_data_path(step)
-                    if os.path.exists(data_path):
-                        os.remove(data_path)
+                for step in list(self._record_files):
+                    self.close_records(step)
+                    
+                # One directory scan finds every step data and record file,
+                # instead of probing each candidate path of every step
+                step_files = {
+                    os.path.basename(data_path)
+                    for step in self.completed_steps
+                    for data_path in self._get_step_data_paths(step)
+                }
+                with os.scandir(self.base_dir) as entries:
+                    paths = [
+                        entry.path for entry in entries
+                        if entry.name in step_files or entry.name.endswith('.jsonl')
+                    ]
+                self._unlink_all(paths)
                 self.completed_steps.clear()
+                self._completed_steps_list.clear()
                 self.step_data.clear()
+                self.step_metadata.clear()
                 
-                # Remove checkpoint file
-                checkpoint_file = os.path.join(self.base_dir, 'completed_steps.json')
-                if os.path.exists(checkpoint_file):
-                    os.remove(checkpoint_file)
+                # Remove checkpoint file and empty the journal
+                _unlink_if_present(self._index_path)
+                os.ftruncate(self._journal_fd, 0)
+                self._journal_commits = 0
             else:
                 # Clear specific steps
+                paths = []
                 for step in steps:
+                    self.close_records(step)
+                    paths.append(self._get_records_path(step))
                     if step in self.completed_steps:
-                        data_path = self._get_data_path(step)
-                        if os.path.exists(data_path):
-                            os.remove(data_path)
-                        self.completed_steps.remove(step)
-                        self.step_data.pop(step, None)
-                        
-                # Update checkpoint file
-                checkpoint_data = {
-                    'completed_steps': list(self.completed_steps),
-                    'last_updated': datetime.now().isoformat()
-                }
+                        paths.extend(self._get_step_data_paths(step))
+                self._unlink_all(paths)
                 
-                checkpoint_file = os.path.join(self.base_dir, 'completed_steps.json')
-                with open(checkpoint_file, 'w') as f:
-                    json.dump(checkpoint_data, f, indent=2)
+                for step in steps:
+                    self.completed_steps.discard(step)
+                    self.step_data.pop(step, None)
+                    self.step_metadata.pop(step, None)
+                self._completed_steps_list = [
+                    step for step in self._completed_steps_list
+                    if step in self.completed_steps
+                ]
+                    
+                # The journal can't record removals, so compact it away
+                self._write_snapshot()
                     
             logger.info(
                 f"Cleared checkpoints for: {', '.join(steps) if steps else 'all steps'}"
@@ -221,12 +758,4 @@ class CheckpointManager:
         Returns:
             Step metadata if available, None otherwise
         """
-        try:
-            checkpoint_file = os.path.join(self.base_dir, 'completed_steps.json')
-            if os.path.exists(checkpoint_file):
-                with open(checkpoint_file) as f:
-                    checkpoint_data = json.load(f)
-                    return checkpoint_data.get('metadata', {}).get(step_name)
-        except Exception as e:
-            logger.error(f"Error getting metadata for {step_name}: {str(e)}")
-        return None
+        return self.step_metadata.get(step_name)
@@ -1,35 +1,120 @@
 """ChEMBL API client for retrieving binding data."""
 
-from typing import Any, Dict, List
+import functools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pandas as pd
 from chembl_webresource_client.new_client import new_client
+from cache_manager import CacheManager
+from config import CHEMBL_MAX_WORKERS
 from models import BindingData
 from logger import LogManager
 
 
+# Activity fields read into BindingData
+ACTIVITY_FIELDS = [
+    'target_pref_name',
+    'target_components',
+    'value',
+    'type',
+    'units',
+    'assay_description',
+    'document_chembl_id',
+    'confidence_score'
+]
+
+# Binding activities fetched for each compound
+ACTIVITY_FILTERS = {
+    'type__in': ['Ki', 'IC50', 'Kd', 'EC50'],
+    'relation__in': ['=', '<', '>', '<=', '>='],
+    'standard_units__isnull': False
+}
+MAX_ACTIVITIES = 12
+
+# ChEMBL IDs looked up per request by get_compounds_by_chembl_ids
+BULK_SIZE = 50
+
+# Retry backoff in seconds: attempt n sleeps up to min(CAP, BASE * 2**n)
+RETRY_BASE = 0.2
+RETRY_CAP = 30.0
+
+
+def _first_component(components: Any) -> Dict[str, Any]:
+    """Get an activity's first target component, or {} if it has none."""
+    return components[0] if isinstance(components, list) and components else {}
+
+
+def _text_column(column: pd.Series) -> pd.Series:
+    """Replace missing and empty activity values with 'N/A'."""
+    return column.where(column.notna() & (column != ''), 'N/A')
+
+
+def _number_column(column: pd.Series) -> pd.Series:
+    """Parse activity values as numbers, treating missing and empty as 0.0."""
+    column = column.where(column.notna() & (column != ''), 0.0)
+    return pd.to_numeric(column, errors='coerce')
+
+
+def _retry(
+    action: str,
+    tries: int = 3,
+    on_retry: Optional[Callable[[Any], None]] = None
+) -> Callable:
+    """
+    Retry a ChEMBLClient method with capped, jittered exponential backoff.
+    
+    Sleeping a random fraction of the backoff keeps clients that failed
+    together from all retrying at the same moment.
+    
+    Args:
+        action: Description of the method's work for warning messages
+        tries: Total number of attempts before the error is re-raised
+        on_retry: Called with the client before each retry
+        
+    Returns:
+        Method decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            for attempt in range(tries):
+                try:
+                    if attempt > 0 and on_retry is not None:
+                        on_retry(self)
+                    return func(self, *args, **kwargs)
+                except Exception as e:
+                    self.logger.warning(f"Error {action} (attempt {attempt + 1}/{tries}): {str(e)}")
+                    if attempt == tries - 1:
+                        raise
+                    time.sleep(random.uniform(0, min(RETRY_CAP, RETRY_BASE * 2 ** attempt)))
+        return wrapper
+    return decorator
+
+
 class ChEMBLClient:
     """Client for ChEMBL API using official Python client."""
     
     def __init__(self):
         """Initialize ChEMBL client."""
         self.logger = LogManager().get_logger("chembl_client")
+        self.cache = CacheManager()
         self._init_clients()
         
+        # Runs the identifier probes of a compound search concurrently
+        self._probe_executor = ThreadPoolExecutor(max_workers=4)
+        
+        # Runs whole compound searches concurrently; kept apart from the
+        # probe pool so searches never wait on their own pool's workers
+        self._search_executor = ThreadPoolExecutor(max_workers=CHEMBL_MAX_WORKERS)
+        
+    @_retry('initializing ChEMBL clients')
     def _init_clients(self):
         """Initialize ChEMBL API clients with retry."""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                self.molecule = new_client.molecule
-                self.activity = new_client.activity
-                self.target = new_client.target
-                return
-            except Exception as e:
-                self.logger.warning(f"Error initializing ChEMBL clients (attempt {attempt + 1}/{max_retries}): {str(e)}")
-                if attempt < max_retries - 1:
-                    import time
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    raise
+        self.molecule = new_client.molecule
+        self.activity = new_client.activity
+        self.target = new_client.target
 
     def search_compound(self, compound: Dict[str, str]) -> Dict[str, Any]:
         """
@@ -41,42 +126,77 @@ class ChEMBLClient:
         Returns:
             Compound data
         """
+        # Identifier probes, best match first: exact matches, then the
+        # costlier fuzzy name and structure matches
+        exact_probes = []
+        fuzzy_probes = []
+        if compound.get('name'):
+            exact_probes.extend([
+                {'pref_name__iexact': compound['name']},
+                {'molecule_synonyms__synonym__iexact': compound['name']}
+            ])
+            fuzzy_probes.append({'pref_name__icontains': compound['name']})
+        if compound.get('cas'):
+            exact_probes.append({'molecule_synonyms__synonym__iexact': compound['cas']})
+        if compound.get('inchi'):
+            exact_probes.append({'molecule_structures__standard_inchi': compound['inchi']})
+        if compound.get('smiles'):
+            fuzzy_probes.append({'molecule_structures__canonical_smiles__flexmatch': compound['smiles']})
+            
+        if not exact_probes and not fuzzy_probes:
+            return {}
+            
+        cache_key = f"chembl:search:{exact_probes + fuzzy_probes}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            if cached['chembl_id']:
+                return self.get_compound_by_chembl_id(cached['chembl_id'])
+            return {}
+            
+        # The API can't OR filters on different fields, so each group's
+        # probes are sent together; fuzzy probes only go out if no exact
+        # probe matched
+        chembl_id = None
         try:
-            # Try exact name match first
-            if compound.get('name'):
-                # Try exact match
-                results = list(self.molecule.filter(pref_name__iexact=compound['name']))
-                if not results:
-                    # Try synonym match
-                    results = list(self.molecule.filter(molecule_synonyms__synonym__iexact=compound['name']))
-                if not results:
-                    # Try fuzzy name match
-                    results = list(self.molecule.filter(pref_name__icontains=compound['name']))
-                if results:
-                    return self.get_compound_by_chembl_id(results[0]['molecule_chembl_id'])
-                    
-            # Try CAS number
-            if compound.get('cas'):
-                results = list(self.molecule.filter(molecule_synonyms__synonym__iexact=compound['cas']))
-                if results:
-                    return self.get_compound_by_chembl_id(results[0]['molecule_chembl_id'])
-                    
-            # Try structure search if SMILES is available
-            if compound.get('smiles'):
-                results = list(self.molecule.filter(molecule_structures__canonical_smiles__flexmatch=compound['smiles']))
-                if results:
-                    return self.get_compound_by_chembl_id(results[0]['molecule_chembl_id'])
-                    
-            # Try InChI search
-            if compound.get('inchi'):
-                results = list(self.molecule.filter(molecule_structures__standard_inchi=compound['inchi']))
-                if results:
-                    return self.get_compound_by_chembl_id(results[0]['molecule_chembl_id'])
+            for probes in (exact_probes, fuzzy_probes):
+                matches = list(self._probe_executor.map(self._first_match, probes))
+                chembl_id = next((match for match in matches if match), None)
+                if chembl_id:
+                    break
+            # Only cache a completed search, matched or not
+            self.cache.set(cache_key, {'chembl_id': chembl_id})
         except Exception as e:
             self.logger.warning(f"Error searching compound: {str(e)}")
                 
+        if chembl_id:
+            return self.get_compound_by_chembl_id(chembl_id)
         return {}
 
+    def search_compounds_batch(self, compounds: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Search for several compounds concurrently.
+        
+        Args:
+            compounds: Identifier dictionaries, as accepted by search_compound
+            
+        Returns:
+            Compound data for each compound, in input order
+        """
+        return list(self._search_executor.map(self.search_compound, compounds))
+
+    def _first_match(self, filters: Dict[str, str]) -> Optional[str]:
+        """
+        Get the ChEMBL ID of the first molecule matching a filter.
+        
+        Args:
+            filters: Molecule filter keyword arguments
+            
+        Returns:
+            ChEMBL ID, or None if nothing matched
+        """
+        results = list(self.molecule.filter(**filters).only(['molecule_chembl_id'])[:1])
+        return results[0]['molecule_chembl_id'] if results else None
+
     def get_compound_by_chembl_id(self, chembl_id: str) -> Dict[str, Any]:
         """
         Get compound data by ChEMBL ID.
@@ -87,32 +207,121 @@ class ChEMBLClient:
         Returns:
             Compound data
         """
-        max_retries = 3
-        for attempt in range(max_retries):
+        # ChEMBL records don't change, so the raw responses are cached
+        cache_key = f"chembl:compound:{chembl_id}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            molecule_data = cached['molecule']
+            activities = cached['activities']
+        else:
             try:
-                # Re-initialize clients if needed
-                if attempt > 0:
-                    self._init_clients()
-                    
-                # Get molecule details
-                molecule_data = self.molecule.get(chembl_id)
+                molecule_data, activities = self._fetch_compound(chembl_id)
+            except Exception:
+                return {}
+            self.cache.set(cache_key, {'molecule': molecule_data, 'activities': activities})
+            
+        return self._compound_data(chembl_id, molecule_data, activities)
+
+    @_retry('getting compound data', on_retry=lambda client: client._init_clients())
+    def _fetch_compound(self, chembl_id: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Fetch a compound's molecule record and binding activities.
+        
+        Args:
+            chembl_id: ChEMBL ID
+            
+        Returns:
+            Tuple of molecule record and activity records
+        """
+        molecule_data = self.molecule.get(chembl_id)
+        activities = list(self.activity.filter(
+            molecule_chembl_id=chembl_id,
+            **ACTIVITY_FILTERS
+        )[:MAX_ACTIVITIES])
+        return molecule_data, activities
+
+    def get_compounds_by_chembl_ids(self, chembl_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get compound data for many ChEMBL IDs with bulk requests.
+        
+        Molecules are fetched for BULK_SIZE IDs per request. Activities are
+        still fetched with one request per ID: a bulk activity query can't be
+        limited per molecule, so it would page through every activity of
+        well-studied ligands (often thousands) only to keep MAX_ACTIVITIES
+        of each. A capped request per ID costs one round trip but never
+        more than one page.
+        
+        Args:
+            chembl_ids: ChEMBL IDs
+            
+        Returns:
+            Dictionary mapping each ChEMBL ID to its compound data, which is
+            empty if the ID couldn't be fetched
+        """
+        responses = {}
+        missing = []
+        for chembl_id in dict.fromkeys(chembl_ids):
+            cached = self.cache.get(f"chembl:compound:{chembl_id}")
+            if cached is not None:
+                responses[chembl_id] = cached
+            else:
+                missing.append(chembl_id)
                 
-                # Get binding data
-                activities = list(self.activity.filter(
-                    molecule_chembl_id=chembl_id,
-                    type__in=['Ki', 'IC50', 'Kd', 'EC50'],
-                    relation__in=['=', '<', '>', '<=', '>='],
-                    standard_units__isnull=False
-                )[:12])
-                break
+        for start in range(0, len(missing), BULK_SIZE):
+            batch = missing[start:start + BULK_SIZE]
+            try:
+                molecules = self.molecule.filter(
+                    molecule_chembl_id__in=batch
+                ).only(['molecule_chembl_id', 'pref_name', 'molecule_synonyms'])
+                batch_responses = {}
+                for molecule in molecules:
+                    chembl_id = molecule['molecule_chembl_id']
+                    activities = list(self.activity.filter(
+                        molecule_chembl_id=chembl_id,
+                        **ACTIVITY_FILTERS
+                    ).only(ACTIVITY_FIELDS)[:MAX_ACTIVITIES])
+                    batch_responses[chembl_id] = {
+                        'molecule': molecule,
+                        'activities': activities
+                    }
             except Exception as e:
-                self.logger.warning(f"Error getting compound data (attempt {attempt + 1}/{max_retries}): {str(e)}")
-                if attempt < max_retries - 1:
-                    import time
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    return {}
+                self.logger.warning(f"Error getting compound data for {len(batch)} ChEMBL IDs: {str(e)}")
+                continue
+                
+            for chembl_id, response in batch_responses.items():
+                self.cache.set(f"chembl:compound:{chembl_id}", response)
+            responses.update(batch_responses)
+            
+        compounds = {}
+        for chembl_id in chembl_ids:
+            response = responses.get(chembl_id)
+            if response is None:
+                compounds[chembl_id] = {}
+            else:
+                compounds[chembl_id] = self._compound_data(
+                    chembl_id,
+                    response['molecule'],
+                    response['activities']
+                )
+        return compounds
+
+    def _compound_data(
+        self,
+        chembl_id: str,
+        molecule_data: Optional[Dict[str, Any]],
+        activities: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Build compound data from ChEMBL molecule and activity responses.
         
+        Args:
+            chembl_id: ChEMBL ID
+            molecule_data: Molecule record
+            activities: Binding activity records
+            
+        Returns:
+            Compound data
+        """
         data = {
             'chembl_id': chembl_id,
             'binding_data': []
@@ -126,28 +335,53 @@ class ChEMBLClient:
                     'chembl_url': f"https://www.ebi.ac.uk/chembl/compound/{chembl_id}"
                 })
                 
-            for activity in activities:
-                try:
-                    binding = BindingData(
-                        target_common_name=activity.get('target_pref_name') or 'N/A',
-                        target_protein_name=(activity.get('target_components', [{}]) or [{}])[0].get('protein_name') or 'N/A',
-                        target_gene_name=(activity.get('target_components', [{}]) or [{}])[0].get('gene_name') or 'N/A',
-                        affinity_value=float(activity.get('value') or 0.0),
-                        affinity_type=activity.get('type') or 'N/A',
-                        affinity_unit=activity.get('units') or 'N/A',
-                        assay_description=activity.get('assay_description') or 'N/A',
-                        reference=activity.get('document_chembl_id') or 'N/A',
-                        confidence_score=float(activity.get('confidence_score') or 0.0)
-                    )
-                    data['binding_data'].append(binding)
-                except Exception as e:
-                    self.logger.warning(f"Error processing activity data: {str(e)}")
-                    continue
+            data['binding_data'] = self._build_binding_data(activities)
         except Exception as e:
             self.logger.warning(f"Error processing molecule data: {str(e)}")
                 
         return data
 
+    def _build_binding_data(self, activities: List[Dict[str, Any]]) -> List[BindingData]:
+        """
+        Convert ChEMBL activity records to BindingData in one columnar pass.
+        
+        Args:
+            activities: Activity records returned by the ChEMBL API
+            
+        Returns:
+            BindingData for every activity with parseable numeric values
+        """
+        if not activities:
+            return []
+            
+        df = pd.DataFrame.from_records(activities).reindex(columns=ACTIVITY_FIELDS)
+        
+        # Unpack the first target component of every activity in one pass
+        components = pd.DataFrame(
+            [_first_component(c) for c in df['target_components']],
+            columns=['protein_name', 'gene_name']
+        )
+        rows = pd.DataFrame({
+            'target_common_name': _text_column(df['target_pref_name']),
+            'target_protein_name': _text_column(components['protein_name']),
+            'target_gene_name': _text_column(components['gene_name']),
+            'affinity_value': _number_column(df['value']),
+            'affinity_type': _text_column(df['type']),
+            'affinity_unit': _text_column(df['units']),
+            'assay_description': _text_column(df['assay_description']),
+            'reference': _text_column(df['document_chembl_id']),
+            'confidence_score': _number_column(df['confidence_score'])
+        })
+        
+        # Skip activities whose values aren't numbers
+        invalid = rows['affinity_value'].isna() | rows['confidence_score'].isna()
+        if invalid.any():
+            self.logger.warning(f"Skipping {int(invalid.sum())} activities with non-numeric values")
+            rows = rows[~invalid]
+            
+        # Columns are in BindingData field order
+        return [BindingData(*row) for row in rows.itertuples(index=False, name=None)]
+
     def search_targets(self, query: str) -> List[Dict[str, Any]]:
         """
         Search for protein targets.
@@ -1,18 +1,224 @@
 """Chemical property calculations using RDKit."""
 
+import math
+import os
+import tempfile
+from functools import lru_cache
 from typing import Dict, Any, Optional, Tuple, List
 import numpy as np
 
-from rdkit import Chem
+from rdkit import Chem, DataStructs
 from rdkit.Chem import (
     Descriptors, AllChem, Crippen, rdMolDescriptors, 
-    rdDepictor, rdMolTransforms, rdFMCS, rdMolAlign
+    rdDepictor, rdFMCS, rdMolAlign, rdFingerprintGenerator
 )
 from rdkit.Chem.Draw import rdDepictor
 from rdkit.Chem.rdDepictor import Compute2DCoords
+from rdkit.ML.Descriptors.MoleculeDescriptors import MolecularDescriptorCalculator
 
+from cache_manager import CacheManager
+from config import BATCH_SIZE, MAX_WORKERS
 from logger import LogManager
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy kernel is used without it
+    njit = None
+
+# Standard atomic weights indexed by atomic number
+_PERIODIC_TABLE = Chem.GetPeriodicTable()
+_ATOMIC_MASSES = np.array(
+    [_PERIODIC_TABLE.GetAtomicWeight(z) for z in range(119)],
+    dtype=np.float64
+)
+
+# 2D properties reported by calculate_properties, keyed by RDKit descriptor
+# name; the calculator resolves the descriptor functions once at import
+_DESCRIPTOR_KEYS = {
+    'ExactMolWt': 'molecular_weight',
+    'MolLogP': 'logp',
+    'NumHDonors': 'hbd',
+    'NumHAcceptors': 'hba',
+    'TPSA': 'tpsa',
+    'NumRotatableBonds': 'rotatable_bonds',
+    'RingCount': 'rings',
+    'NumAromaticRings': 'aromatic_rings',
+    'HeavyAtomCount': 'heavy_atoms',
+    'FractionCSP3': 'fraction_sp3',
+    'BertzCT': 'complexity',
+    'qed': 'qed'  # Drug-likeness score
+}
+_DESCRIPTOR_CALCULATOR = MolecularDescriptorCalculator(list(_DESCRIPTOR_KEYS))
+
+
+@lru_cache(maxsize=32768)
+def _parse_smiles(smiles: str) -> Optional[Chem.Mol]:
+    """Parse a SMILES once; callers must not modify the shared result."""
+    return Chem.MolFromSmiles(smiles)
+
+
+def _mol_from_smiles(smiles: str) -> Optional[Chem.Mol]:
+    """Get a private copy of a SMILES's molecule, or None if it cannot be parsed."""
+    mol = _parse_smiles(smiles)
+    return Chem.Mol(mol) if mol is not None else None
+
+
+@lru_cache(maxsize=32768)
+def _smiles_to_ids(smiles: str) -> Tuple[str, str]:
+    """Get (InChI, InChI Key) for a parseable SMILES; both empty on failure."""
+    inchi = Chem.MolToInchi(_parse_smiles(smiles))
+    return (inchi, Chem.InchiToInchiKey(inchi)) if inchi else ('', '')
+
+
+# Part of the property cache key; bump when calculate_properties' results change
+PROPERTIES_VERSION = 1
+
+# Seconds an embedding may take before RDKit abandons it
+EMBED_TIMEOUT = 10
+
+
+def _embed_params(**overrides: Any) -> AllChem.EmbedParameters:
+    """
+    Build ETKDGv3 embedding parameters with the shared defaults.
+    
+    Args:
+        **overrides: EmbedParameters attributes to set
+        
+    Returns:
+        Embedding parameters
+    """
+    params = AllChem.ETKDGv3()
+    params.randomSeed = 42
+    # Random starting coordinates avoid the eigenvector initialization that
+    # fails on some fused ring systems
+    params.useRandomCoords = True
+    # Give up on pathological molecules (e.g. macrocycles) rather than
+    # stalling a batch; only RDKit versions with the option support it
+    if hasattr(params, 'timeout'):
+        params.timeout = EMBED_TIMEOUT
+    for name, value in overrides.items():
+        setattr(params, name, value)
+    return params
+
+
+_EMBED_PARAMS = _embed_params()
+_CONFORMER_PARAMS = _embed_params(pruneRmsThresh=0.5, numThreads=MAX_WORKERS)
+# Adds conformers next to those a molecule already has
+_EXTRA_CONFORMER_PARAMS = _embed_params(
+    pruneRmsThresh=0.5, numThreads=MAX_WORKERS, clearConfs=False
+)
+
+# Substructure matches counted per molecule for num_mcs_matches
+MAX_MCS_MATCHES = 100
+
+# Seconds an MCS search may run before similarity falls back to fingerprints
+MCS_TIMEOUT = 2
+# Pairs whose molecular weight ratio is below this skip the MCS search
+MIN_MCS_MW_RATIO = 0.3
+
+
+def _mcs_params() -> rdFMCS.MCSParameters:
+    """
+    Build the MCS search parameters shared by all similarity calculations.
+    
+    Returns:
+        MCS parameters
+    """
+    params = rdFMCS.MCSParameters()
+    params.Timeout = MCS_TIMEOUT
+    # Partial rings make the search space explode on fused systems
+    params.AtomCompareParameters.CompleteRingsOnly = True
+    params.BondCompareParameters.RingMatchesRingOnly = True
+    params.BondCompareParameters.CompleteRingsOnly = True
+    params.BondTyper = rdFMCS.BondCompare.CompareOrderExact
+    return params
+
+
+_MCS_PARAMS = _mcs_params()
+_MORGAN_GENERATOR = rdFingerprintGenerator.GetMorganGenerator(radius=2, fpSize=2048)
+
+
+def _similarity_properties(mol: Chem.Mol) -> np.ndarray:
+    """Get the properties compared by property similarity as an array."""
+    return np.array([
+        Descriptors.ExactMolWt(mol),
+        Crippen.MolLogP(mol),
+        Descriptors.TPSA(mol),
+        rdMolDescriptors.CalcNumHBD(mol),
+        rdMolDescriptors.CalcNumHBA(mol)
+    ], dtype=float)
+
+
+def _second_moment_numpy(masses: np.ndarray, coords: np.ndarray) -> np.ndarray:
+    """Get the mass-weighted second moment tensor about the center of mass."""
+    # One matrix product and the parallel axis theorem rather than a
+    # centered copy of the coordinates
+    total_mass = masses.sum()
+    com = masses @ coords / total_mass
+    return (coords.T * masses) @ coords - total_mass * np.outer(com, com)
+
+
+if njit is not None:
+    @njit('f8[:,:](f8[:], f8[:,:])', cache=True, fastmath=True)
+    def _second_moment(masses, coords):
+        """Get the mass-weighted second moment tensor about the center of mass."""
+        # Accumulate the mass, first and second moments in one pass over
+        # the atoms, without the temporaries of the NumPy kernel
+        total_mass = 0.0
+        first = np.zeros(3)
+        P = np.zeros((3, 3))
+        for i in range(masses.shape[0]):
+            m = masses[i]
+            total_mass += m
+            for j in range(3):
+                first[j] += m * coords[i, j]
+                for k in range(j, 3):
+                    P[j, k] += m * coords[i, j] * coords[i, k]
+        for j in range(3):
+            for k in range(j, 3):
+                P[j, k] -= first[j] * first[k] / total_mass
+                P[k, j] = P[j, k]
+        return P
+else:
+    _second_moment = _second_moment_numpy
+
+
+def _symmetric_eigvals_3x3(A: List[List[float]]) -> np.ndarray:
+    """
+    Get the eigenvalues of a symmetric 3x3 matrix in closed form.
+    
+    Uses the trigonometric solution of the characteristic cubic (Smith,
+    1961), which avoids LAPACK's dispatch overhead on such a small matrix.
+    
+    Args:
+        A: Symmetric matrix as nested lists
+        
+    Returns:
+        Eigenvalues in ascending order
+    """
+    a00, a01, a02 = A[0]
+    _, a11, a12 = A[1]
+    a22 = A[2][2]
+    p1 = a01 * a01 + a02 * a02 + a12 * a12
+    if p1 == 0.0:
+        return np.sort(np.array([a00, a11, a22]))
+        
+    # Eigenvalues of A are q + p * (eigenvalues of B = (A - qE) / p)
+    q = (a00 + a11 + a22) / 3.0
+    b00, b11, b22 = a00 - q, a11 - q, a22 - q
+    p = math.sqrt((b00 * b00 + b11 * b11 + b22 * b22 + 2.0 * p1) / 6.0)
+    det = (
+        b00 * (b11 * b22 - a12 * a12)
+        - a01 * (a01 * b22 - a12 * a02)
+        + a02 * (a01 * a12 - b11 * a02)
+    )
+    # Rounding can push det(B) / 2 just outside [-1, 1]
+    r = min(max(det / (2.0 * p ** 3), -1.0), 1.0)
+    phi = math.acos(r) / 3.0
+    largest = q + 2.0 * p * math.cos(phi)
+    smallest = q + 2.0 * p * math.cos(phi + 2.0 * math.pi / 3.0)
+    return np.array([smallest, 3.0 * q - largest - smallest, largest])
+
 
 class ChemicalProperties:
     """Handles chemical property calculations using RDKit."""
@@ -20,188 +226,293 @@ class ChemicalProperties:
     def __init__(self):
         """Initialize chemical properties calculator."""
         self.logger = LogManager().get_logger("chemical_properties")
+        self.cache = CacheManager()
 
-    def calculate_properties(self, smiles: str, generate_3d: bool = True) -> Dict[str, Any]:
+    def parse_smiles_batch(self, smiles_list: List[str]) -> List[Optional[Chem.Mol]]:
+        """
+        Parse many SMILES strings on RDKit's parser thread pool.
+        
+        Args:
+            smiles_list: SMILES strings to parse; non-strings such as NaN
+                count as missing
+            
+        Returns:
+            Molecules in input order (None where missing or parsing failed)
+        """
+        mols: List[Optional[Chem.Mol]] = [None] * len(smiles_list)
+        if not smiles_list:
+            return mols
+            
+        # RDKit builds without thread support lack the multithreaded supplier
+        if not hasattr(Chem, 'MultithreadedSmilesMolSupplier'):
+            return [_mol_from_smiles(smiles) for smiles in smiles_list]
+            
+        # The supplier skips blank and '#' lines and splits on whitespace, so
+        # only plain SMILES go through it; anything else is parsed here
+        threaded = []
+        for i, smiles in enumerate(smiles_list):
+            # Missing values (NaN from a blank CSV cell) and empty strings,
+            # which RDKit would parse as an empty molecule, stay None
+            if not isinstance(smiles, str) or not smiles.strip():
+                continue
+            if not smiles.startswith('#') and not any(c.isspace() for c in smiles):
+                threaded.append(i)
+            else:
+                mols[i] = _mol_from_smiles(smiles)
+        if not threaded:
+            return mols
+            
+        fd, path = tempfile.mkstemp(suffix='.smi')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.writelines(f"{smiles_list[i]}\t{i}\n" for i in threaded)
+                
+            supplier = Chem.MultithreadedSmilesMolSupplier(
+                path, delimiter='\t', smilesColumn=0, nameColumn=1,
+                titleLine=False, numWriterThreads=MAX_WORKERS,
+                sizeInputQueue=BATCH_SIZE
+            )
+            # Molecules arrive out of order, named by their input index;
+            # failed records (and the end of input) come back as None
+            for mol in supplier:
+                if mol is not None:
+                    mols[int(mol.GetProp('_Name'))] = mol
+            return mols
+            
+        except Exception as e:
+            self.logger.error(f"Error parsing SMILES batch: {str(e)}")
+            return [_mol_from_smiles(smiles) for smiles in smiles_list]
+        finally:
+            os.unlink(path)
+
+    def calculate_properties(
+        self,
+        smiles: str,
+        generate_3d: bool = True,
+        mol: Optional[Chem.Mol] = None
+    ) -> Dict[str, Any]:
         """
         Calculate molecular properties from SMILES using RDKit.
         
         Args:
             smiles: SMILES string of the compound
             generate_3d: Whether to generate and optimize 3D conformation
+            mol: Optional molecule already parsed from the SMILES
             
         Returns:
             Dictionary of calculated properties
         """
         try:
-            mol = Chem.MolFromSmiles(smiles)
+            if mol is None:
+                mol = _mol_from_smiles(smiles)
             if mol is None:
                 raise ValueError(f"Invalid SMILES string: {smiles}")
                 
+            # Properties depend only on the structure, so earlier runs'
+            # results are reused; InChI and InChIKey depend only on the SMILES
+            inchi, inchi_key = _smiles_to_ids(smiles)
+            cache_key = f"properties:v{PROPERTIES_VERSION}:{int(generate_3d)}:{inchi_key}"
+            if inchi_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    if 'principal_moments' in cached:
+                        cached['principal_moments'] = tuple(cached['principal_moments'])
+                    return cached
+                    
             # Generate 3D conformation if requested
+            embed_failed = False
             if generate_3d:
                 mol = Chem.AddHs(mol)  # Add hydrogens
-                AllChem.EmbedMolecule(mol, randomSeed=42)  # Generate 3D coords
-                AllChem.MMFFOptimizeMolecule(mol)  # Optimize geometry
+                if AllChem.EmbedMolecule(mol, _EMBED_PARAMS) == -1:
+                    # Embedding failed or timed out; report 2D properties only
+                    self.logger.warning("Could not embed 3D structure for %s", smiles)
+                    mol = Chem.RemoveHs(mol)
+                    generate_3d = False
+                    embed_failed = True
+                else:
+                    AllChem.MMFFOptimizeMolecule(mol)  # Optimize geometry
                 
-            # Basic properties
-            props = {
-                'molecular_weight': Descriptors.ExactMolWt(mol),
-                'logp': Crippen.MolLogP(mol),
-                'hbd': rdMolDescriptors.CalcNumHBD(mol),
-                'hba': rdMolDescriptors.CalcNumHBA(mol),
-                'tpsa': Descriptors.TPSA(mol),
-                'rotatable_bonds': rdMolDescriptors.CalcNumRotatableBonds(mol),
-                'rings': rdMolDescriptors.CalcNumRings(mol),
-                'aromatic_rings': rdMolDescriptors.CalcNumAromaticRings(mol),
-                'heavy_atoms': mol.GetNumHeavyAtoms(),
-                'fraction_sp3': rdMolDescriptors.CalcFractionCSP3(mol),
-                'complexity': Descriptors.BertzCT(mol)
-            }
+            # Basic properties in a single descriptor calculator pass
+            props = dict(zip(
+                _DESCRIPTOR_KEYS.values(),
+                _DESCRIPTOR_CALCULATOR.CalcDescriptors(mol)
+            ))
             
             # 3D properties if available
             if generate_3d:
+                # Moments, Rg and shape factors share one inertia analysis
+                inertia = self._inertia_analysis(mol)
+                volume = AllChem.ComputeMolVolume(mol)
                 props.update({
                     'surface_area': AllChem.ComputeMolSurf(mol),
-                    'volume': AllChem.ComputeMolVolume(mol),
-                    'principal_moments': self._calculate_principal_moments(mol),
-                    'radius_of_gyration': self._calculate_radius_of_gyration(mol),
-                    'shape_factors': self._calculate_shape_factors(mol),
+                    'volume': volume,
+                    'van_der_waals_volume': volume,
+                    'principal_moments': self._calculate_principal_moments(mol, inertia),
+                    'radius_of_gyration': self._calculate_radius_of_gyration(mol, inertia),
+                    'shape_factors': self._calculate_shape_factors(mol, inertia),
                     'conformer_energies': self._calculate_conformer_energies(mol)
                 })
             
-            # Generate InChI and InChIKey
-            inchi = Chem.MolToInchi(mol)
             if inchi:
                 props['inchi'] = inchi
-                props['inchi_key'] = Chem.MolToInchiKey(mol)
+                props['inchi_key'] = inchi_key
                 
             # Additional descriptors
             props.update({
-                'qed': Descriptors.qed(mol),  # Drug-likeness score
                 'sas': Descriptors.sas(mol),  # Synthetic accessibility score
                 'charge': Chem.GetFormalCharge(mol),
                 'stereocenters': rdMolDescriptors.CalcNumAtomStereoCenters(mol),
                 'unspecified_stereocenters': (
                     rdMolDescriptors.CalcNumUnspecifiedAtomStereoCenters(mol)
                 ),
-                'topological_polar_surface_area': Descriptors.TPSA(mol),
-                'van_der_waals_volume': Descriptors.ComputeMolVolume(mol)
+                'topological_polar_surface_area': props['tpsa']
             })
             
-            # Clean up
-            if generate_3d:
-                mol = Chem.RemoveHs(mol)
-                
+            # A 2D fallback isn't stored under the 3D key, so the next run
+            # tries embedding again
+            if inchi_key and not embed_failed:
+                self.cache.set(cache_key, props)
             return props
             
         except Exception as e:
             self.logger.error(f"Error calculating properties: {str(e)}")
             return {}
 
-    def _calculate_principal_moments(self, mol: Chem.Mol) -> Tuple[float, float, float]:
+    def _inertia_analysis(
+        self,
+        mol: Chem.Mol
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
         """
-        Calculate principal moments of inertia.
+        Compute the mass distribution shared by the shape descriptors.
         
         Args:
             mol: RDKit molecule with 3D coordinates
             
         Returns:
-            Tuple of principal moments (I1, I2, I3)
+            Tuple of (atomic masses, second moment tensor P about the center
+            of mass, principal moments in ascending order), or None if failed
         """
         try:
             # Get atomic masses and coordinates
-            masses = []
-            coords = []
-            conf = mol.GetConformer()
-            for i, atom in enumerate(mol.GetAtoms()):
-                masses.append(atom.GetMass())
-                pos = conf.GetAtomPosition(i)
-                coords.append([pos.x, pos.y, pos.z])
-                
-            # Convert to numpy arrays
-            masses = np.array(masses)
-            coords = np.array(coords)
-            
-            # Calculate center of mass
-            com = np.average(coords, weights=masses, axis=0)
-            
-            # Translate to center of mass
-            coords -= com
-            
-            # Calculate inertia tensor
-            I = np.zeros((3, 3))
-            for m, r in zip(masses, coords):
-                x, y, z = r
-                I[0, 0] += m * (y * y + z * z)
-                I[1, 1] += m * (x * x + z * z)
-                I[2, 2] += m * (x * x + y * y)
-                I[0, 1] -= m * x * y
-                I[0, 2] -= m * x * z
-                I[1, 2] -= m * y * z
-            I[1, 0] = I[0, 1]
-            I[2, 0] = I[0, 2]
-            I[2, 1] = I[1, 2]
-            
-            # Get eigenvalues (principal moments)
-            moments = np.sort(np.linalg.eigvals(I))
-            return tuple(moments)
+            masses = self._atomic_masses(mol)
+            # GetPositions already returns a fresh C-contiguous float64 (N, 3)
+            # array; asking for exactly that is free and pins the layout the
+            # compiled second moment kernel is specialized for
+            coords = np.ascontiguousarray(
+                mol.GetConformer().GetPositions(), dtype=np.float64
+            )
+            
+            # Second moment P = sum(m * r r^T) about the center of mass
+            P = _second_moment(masses, coords)
+            
+            # Inertia tensor I = tr(P) * E - P
+            I = np.eye(3) * np.trace(P) - P
+            
+            # Get eigenvalues (principal moments) of the symmetric tensor,
+            # real and in ascending order
+            return masses, P, _symmetric_eigvals_3x3(I.tolist())
             
         except Exception as e:
-            self.logger.error(f"Error calculating principal moments: {str(e)}")
+            self.logger.error(f"Error calculating inertia tensor: {str(e)}")
+            return None
+
+    def _atomic_masses(self, mol: Chem.Mol) -> np.ndarray:
+        """
+        Get the mass of every atom in a molecule.
+        
+        Args:
+            mol: RDKit molecule
+            
+        Returns:
+            Array of atomic masses in atom order
+        """
+        atomic_nums = np.fromiter(
+            (atom.GetAtomicNum() for atom in mol.GetAtoms()),
+            dtype=np.int32,
+            count=mol.GetNumAtoms()
+        )
+        masses = _ATOMIC_MASSES[atomic_nums]
+        
+        # Table weights ignore isotope labels; MolWt doesn't, so a mismatch
+        # means some atom needs its own isotopic mass. MolWt also counts
+        # implicit hydrogens, which have no entry in masses
+        implicit_hs = mol.GetNumAtoms(onlyExplicit=False) - mol.GetNumAtoms()
+        expected = masses.sum() + implicit_hs * _ATOMIC_MASSES[1]
+        if not np.isclose(expected, Descriptors.MolWt(mol)):
+            masses = np.fromiter(
+                (atom.GetMass() for atom in mol.GetAtoms()),
+                dtype=np.float64,
+                count=mol.GetNumAtoms()
+            )
+        return masses
+
+    def _calculate_principal_moments(
+        self,
+        mol: Chem.Mol,
+        inertia: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    ) -> Tuple[float, float, float]:
+        """
+        Calculate principal moments of inertia.
+        
+        Args:
+            mol: RDKit molecule with 3D coordinates
+            inertia: Precomputed result of _inertia_analysis (optional)
+            
+        Returns:
+            Tuple of principal moments (I1, I2, I3)
+        """
+        if inertia is None:
+            inertia = self._inertia_analysis(mol)
+        if inertia is None:
             return (0.0, 0.0, 0.0)
+        return tuple(inertia[2])
 
-    def _calculate_radius_of_gyration(self, mol: Chem.Mol) -> float:
+    def _calculate_radius_of_gyration(
+        self,
+        mol: Chem.Mol,
+        inertia: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    ) -> float:
         """
         Calculate radius of gyration.
         
         Args:
             mol: RDKit molecule with 3D coordinates
+            inertia: Precomputed result of _inertia_analysis (optional)
             
         Returns:
             Radius of gyration in Angstroms
         """
-        try:
-            # Get atomic masses and coordinates
-            masses = []
-            coords = []
-            conf = mol.GetConformer()
-            for i, atom in enumerate(mol.GetAtoms()):
-                masses.append(atom.GetMass())
-                pos = conf.GetAtomPosition(i)
-                coords.append([pos.x, pos.y, pos.z])
-                
-            # Convert to numpy arrays
-            masses = np.array(masses)
-            coords = np.array(coords)
-            
-            # Calculate center of mass
-            com = np.average(coords, weights=masses, axis=0)
-            
-            # Calculate radius of gyration
-            rg2 = np.sum(masses * np.sum((coords - com)**2, axis=1)) / np.sum(masses)
-            return np.sqrt(rg2)
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating radius of gyration: {str(e)}")
+        if inertia is None:
+            inertia = self._inertia_analysis(mol)
+        if inertia is None:
             return 0.0
+            
+        # Rg^2 = sum(m * |r|^2) / M, which is tr(P) / M
+        masses, P, _ = inertia
+        return np.sqrt(np.trace(P) / np.sum(masses))
 
-    def _calculate_shape_factors(self, mol: Chem.Mol) -> Dict[str, float]:
+    def _calculate_shape_factors(
+        self,
+        mol: Chem.Mol,
+        inertia: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    ) -> Dict[str, float]:
         """
         Calculate molecular shape factors.
         
         Args:
             mol: RDKit molecule with 3D coordinates
+            inertia: Precomputed result of _inertia_analysis (optional)
             
         Returns:
             Dictionary of shape factors
         """
         try:
-            moments = self._calculate_principal_moments(mol)
+            moments = self._calculate_principal_moments(mol, inertia)
             if not any(moments):
                 return {}
                 
-            # Sort moments in descending order
-            I1, I2, I3 = sorted(moments, reverse=True)
+            # Moments are ascending; shape factors use them descending
+            I3, I2, I1 = moments
             
             # Calculate shape factors
             return {
@@ -227,7 +538,7 @@ class ChemicalProperties:
             Standardized SMILES string or None if failed
         """
         try:
-            mol = Chem.MolFromSmiles(smiles)
+            mol = _mol_from_smiles(smiles)
             if mol is None:
                 return None
                 
@@ -264,64 +575,67 @@ class ChemicalProperties:
             Tuple of (is_valid, error_message)
         """
         try:
-            mol = Chem.MolFromSmiles(smiles)
+            # Only read here, so the shared parse needs no copy
+            mol = _parse_smiles(smiles)
             if mol is None:
                 return False, "Invalid SMILES string"
                 
-            # Check for valence errors
-            try:
-                Chem.SanitizeMol(mol)
-            except Exception as e:
-                return False, f"Structure sanitization failed: {str(e)}"
-                
-            # Check for disconnected fragments
-            if len(Chem.GetMolFrags(mol)) > 1:
+            # MolFromSmiles only returns molecules that passed sanitization,
+            # so valences need no further checks
+            
+            # Check for disconnected fragments; a SMILES without a dot is
+            # always a single connected structure
+            if '.' in smiles and len(Chem.GetMolFrags(mol)) > 1:
                 return False, "Structure contains disconnected fragments"
                 
-            # Check for unusual valences
-            for atom in mol.GetAtoms():
-                if atom.GetImplicitValence() == -1:
-                    return False, f"Unusual valence for atom {atom.GetSymbol()}"
-                    
             return True, "Valid structure"
             
         except Exception as e:
             return False, f"Validation error: {str(e)}"
 
-    def generate_conformers(self, mol: Chem.Mol, n_confs: int = 10) -> List[float]:
+    def generate_conformers(
+        self,
+        mol: Chem.Mol,
+        n_confs: int = 10,
+        add_hs: bool = True,
+        keep_existing: bool = False
+    ) -> List[float]:
         """
         Generate multiple conformers and return their energies.
         
         Args:
             mol: RDKit molecule
             n_confs: Number of conformers to generate
+            add_hs: Whether to add hydrogens to a copy of mol first; when
+                False, mol must already have explicit hydrogens and the
+                conformers are generated on it in place
+            keep_existing: Whether to count mol's existing conformers toward
+                n_confs instead of discarding them (requires add_hs=False)
             
         Returns:
             List of conformer energies
         """
         try:
-            # Add hydrogens and generate conformers
-            mol = Chem.AddHs(mol)
-            AllChem.EmbedMultipleConfs(
+            if add_hs:
+                mol = Chem.AddHs(mol)
+            # Similar conformers are pruned (pruneRmsThresh=0.5)
+            existing = mol.GetNumConformers() if keep_existing and not add_hs else 0
+            if existing:
+                if n_confs > existing:
+                    AllChem.EmbedMultipleConfs(
+                        mol, numConfs=n_confs - existing, params=_EXTRA_CONFORMER_PARAMS
+                    )
+            else:
+                AllChem.EmbedMultipleConfs(mol, numConfs=n_confs, params=_CONFORMER_PARAMS)
+            
+            # Optimize all conformers on RDKit's thread pool; each result is
+            # (status, energy), with status -1 where MMFF has no parameters
+            results = AllChem.MMFFOptimizeMoleculeConfs(
                 mol,
-                numConfs=n_confs,
-                randomSeed=42,
-                pruneRmsThresh=0.5  # Remove similar conformers
+                numThreads=MAX_WORKERS,
+                maxIters=200
             )
-            
-            # Optimize all conformers
-            energies = []
-            for conf_id in range(mol.GetNumConformers()):
-                # Optimize geometry
-                AllChem.MMFFOptimizeMolecule(mol, confId=conf_id)
-                
-                # Calculate energy
-                props = AllChem.MMFFGetMoleculeProperties(mol)
-                energy = AllChem.MMFFGetMoleculeForceField(mol, props, confId=conf_id)
-                if energy:
-                    energies.append(energy.CalcEnergy())
-            
-            return energies
+            return [energy for status, energy in results if status != -1]
             
         except Exception as e:
             self.logger.error(f"Error generating conformers: {str(e)}")
@@ -332,13 +646,14 @@ class ChemicalProperties:
         Calculate conformer energies and statistics.
         
         Args:
-            mol: RDKit molecule with 3D coordinates
+            mol: RDKit molecule with explicit hydrogens and 3D coordinates
             
         Returns:
             Dictionary of energy statistics
         """
         try:
-            energies = self.generate_conformers(mol)
+            # The conformer embedded by calculate_properties is one of the set
+            energies = self.generate_conformers(mol, add_hs=False, keep_existing=True)
             if not energies:
                 return {}
                 
@@ -366,36 +681,48 @@ class ChemicalProperties:
             Dictionary of similarity metrics
         """
         try:
+            # Very differently sized molecules share little; skip the MCS
+            mw1 = Descriptors.MolWt(mol1)
+            mw2 = Descriptors.MolWt(mol2)
+            if min(mw1, mw2) < MIN_MCS_MW_RATIO * max(mw1, mw2):
+                return self._calculate_fingerprint_similarities(mol1, mol2)
+                
             # Find maximum common substructure
-            mcs = rdFMCS.FindMCS([mol1, mol2])
+            mcs = rdFMCS.FindMCS([mol1, mol2], _MCS_PARAMS)
+            if mcs.canceled:
+                # A timed-out search returns a partial MCS; don't report it
+                self.logger.warning(
+                    f"MCS search timed out after {MCS_TIMEOUT}s; "
+                    f"using fingerprint similarity"
+                )
+                return self._calculate_fingerprint_similarities(mol1, mol2)
             mcs_mol = Chem.MolFromSmarts(mcs.smartsString)
             
-            # Get matches for MCS in both molecules
-            matches1 = mol1.GetSubstructMatches(mcs_mol)
-            matches2 = mol2.GetSubstructMatches(mcs_mol)
-            
-            # Calculate RMSD after alignment using MCS
-            if matches1 and matches2:
-                # Transform molecules to align MCS
-                conf1 = mol1.GetConformer()
-                conf2 = mol2.GetConformer()
-                match1 = matches1[0]
-                match2 = matches2[0]
-                
-                # Use rdMolTransforms to align molecules
-                rdMolTransforms.AlignMolConformers(mol1, mol2, atomIds1=match1, atomIds2=match2)
-                rmsd = rdMolTransforms.GetBestRMS(mol1, mol2, match1, match2)
+            # The first match in each molecule is enough to align them
+            match1 = mol1.GetSubstructMatch(mcs_mol)
+            match2 = mol2.GetSubstructMatch(mcs_mol)
+            
+            # Calculate RMSD after aligning mol2 onto mol1 over the MCS atoms
+            if match1 and match2:
+                atom_map = list(zip(match2, match1))
+                rmsd = rdMolAlign.AlignMol(mol2, mol1, atomMap=atom_map)
             else:
                 rmsd = float('inf')
+                
+            # Counting matches enumerates them, so stop at MAX_MCS_MATCHES
+            num_matches1 = len(mol1.GetSubstructMatches(mcs_mol, maxMatches=MAX_MCS_MATCHES))
+            num_matches2 = len(mol2.GetSubstructMatches(mcs_mol, maxMatches=MAX_MCS_MATCHES))
             
             # Calculate various similarity metrics
             similarities = {
                 'mcs_size': mcs.numAtoms,
                 'mcs_fraction': mcs.numAtoms / min(mol1.GetNumAtoms(), mol2.GetNumAtoms()),
-                'shape_similarity': rdMolAlign.AlignMol(mol1, mol2),
+                # Same alignment as the RMSD; aligning again without the MCS
+                # atom map fails unless one molecule contains the other
+                'shape_similarity': rmsd,
                 'property_similarity': self._calculate_property_similarity(mol1, mol2),
                 'rmsd_after_alignment': rmsd,
-                'num_mcs_matches': len(matches1) * len(matches2)
+                'num_mcs_matches': num_matches1 * num_matches2
             }
             
             return similarities
@@ -404,6 +731,63 @@ class ChemicalProperties:
             self.logger.error(f"Error calculating similarity: {str(e)}")
             return {}
 
+    def calculate_similarity_matrix(self, mols: List[Chem.Mol]) -> np.ndarray:
+        """
+        Calculate Morgan fingerprint Tanimoto similarity between all pairs.
+        
+        Fingerprints are computed once and compared in bulk, so this suits
+        whole libraries; use calculate_similarity on a shortlist of pairs
+        for MCS and alignment metrics.
+        
+        Args:
+            mols: RDKit molecules
+            
+        Returns:
+            Symmetric (n, n) float32 similarity matrix
+        """
+        n = len(mols)
+        sim = np.empty((n, n), dtype=np.float32)
+        try:
+            # Bulk fingerprinting runs threaded on recent RDKit versions
+            if hasattr(_MORGAN_GENERATOR, 'GetFingerprints'):
+                fps = _MORGAN_GENERATOR.GetFingerprints(mols, numThreads=MAX_WORKERS)
+            else:
+                fps = [_MORGAN_GENERATOR.GetFingerprint(mol) for mol in mols]
+                
+            # Fill the upper triangle row by row and mirror it
+            for i in range(n):
+                sim[i, i:] = DataStructs.BulkTanimotoSimilarity(fps[i], fps[i:])
+            lower = np.tril_indices(n, -1)
+            sim[lower] = sim.T[lower]
+            return sim
+            
+        except Exception as e:
+            self.logger.error(f"Error calculating similarity matrix: {str(e)}")
+            return np.zeros((n, n), dtype=np.float32)
+
+    def _calculate_fingerprint_similarities(
+        self,
+        mol1: Chem.Mol,
+        mol2: Chem.Mol
+    ) -> Dict[str, float]:
+        """
+        Calculate similarity metrics that don't need an MCS.
+        
+        Args:
+            mol1: First RDKit molecule
+            mol2: Second RDKit molecule
+            
+        Returns:
+            Dictionary with Morgan fingerprint Tanimoto and property similarity
+        """
+        return {
+            'fingerprint_similarity': DataStructs.TanimotoSimilarity(
+                _MORGAN_GENERATOR.GetFingerprint(mol1),
+                _MORGAN_GENERATOR.GetFingerprint(mol2)
+            ),
+            'property_similarity': self._calculate_property_similarity(mol1, mol2)
+        }
+
     def _calculate_property_similarity(self, mol1: Chem.Mol, mol2: Chem.Mol) -> float:
         """
         Calculate similarity based on molecular properties.
@@ -416,35 +800,17 @@ class ChemicalProperties:
             Property-based similarity score
         """
         try:
-            # Calculate properties for both molecules
-            props1 = {
-                'mw': Descriptors.ExactMolWt(mol1),
-                'logp': Crippen.MolLogP(mol1),
-                'tpsa': Descriptors.TPSA(mol1),
-                'hbd': rdMolDescriptors.CalcNumHBD(mol1),
-                'hba': rdMolDescriptors.CalcNumHBA(mol1)
-            }
-            
-            props2 = {
-                'mw': Descriptors.ExactMolWt(mol2),
-                'logp': Crippen.MolLogP(mol2),
-                'tpsa': Descriptors.TPSA(mol2),
-                'hbd': rdMolDescriptors.CalcNumHBD(mol2),
-                'hba': rdMolDescriptors.CalcNumHBA(mol2)
-            }
-            
-            # Calculate normalized differences
-            diffs = []
-            weights = {'mw': 0.2, 'logp': 0.2, 'tpsa': 0.2, 'hbd': 0.2, 'hba': 0.2}
+            p1 = _similarity_properties(mol1)
+            p2 = _similarity_properties(mol2)
             
-            for prop in props1:
-                max_val = max(abs(props1[prop]), abs(props2[prop]))
-                if max_val > 0:
-                    diff = abs(props1[prop] - props2[prop]) / max_val
-                    diffs.append(diff * weights[prop])
+            # Equally weighted normalized differences; properties that are
+            # zero in both molecules count as identical
+            denom = np.maximum(np.abs(p1), np.abs(p2))
+            mask = denom > 0
+            diffs = np.where(mask, np.abs(p1 - p2) / np.where(mask, denom, 1.0), 0.0)
             
             # Return similarity score (1 - average difference)
-            return 1 - sum(diffs)
+            return float(1.0 - diffs.mean())
             
         except Exception as e:
             self.logger.error(f"Error calculating property similarity: {str(e)}")
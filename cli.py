@@ -10,15 +10,17 @@ from data_processor import DataProcessor
 from logger import LogManager
 
 
-def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+# Choices are tuples so help output keeps their order
+_SOURCE_CHOICES = tuple(DATA_SOURCES.keys())
+_LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Parse command line arguments.
+    Build the command line argument parser.
     
-    Args:
-        args: Optional list of command line arguments
-        
     Returns:
-        Parsed arguments
+        Argument parser
     """
     parser = argparse.ArgumentParser(
         description="Chemical compound data collection tool"
@@ -42,14 +44,14 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
         '-s', '--sources',
         type=str,
         nargs='+',
-        choices=list(DATA_SOURCES.keys()),
+        choices=_SOURCE_CHOICES,
         help='Data sources to use (default: all enabled sources)'
     )
     
     parser.add_argument(
         '--log-level',
         type=str,
-        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+        choices=_LOG_LEVELS,
         default=LOG_LEVEL,
         help='Logging level'
     )
@@ -60,7 +62,24 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
         help='Clear cache before processing'
     )
     
-    return parser.parse_args(args)
+    return parser
+
+
+# Built once so repeated main() calls don't rebuild it
+_PARSER = _build_parser()
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        args: Optional list of command line arguments
+        
+    Returns:
+        Parsed arguments
+    """
+    return _PARSER.parse_args(args)
 
 
 def validate_files(input_file: str, output_file: str) -> None:
@@ -14,13 +14,18 @@ BINDINGDB_DATA_URL = "https://bindingdb.org/bind/BindingDB_All.tsv"
 SERP_API_KEY = os.getenv('SERP_API_KEY', '')  # Get from environment variable
 
 # Rate Limiting
-API_RATE_LIMIT = 2.0  # seconds between requests
+API_RATE_LIMIT = 2.0  # seconds between requests, unless listed below
+RATE_LIMITS = {  # seconds between requests for each API client
+    'pubchem': 0.2,  # PubChem allows 5 requests per second
+    'pubmed': 0.34  # E-utilities allow 3 requests per second without a key
+}
 MAX_RETRIES = 3
 RETRY_DELAY = 2.0  # seconds
 
 # Batch Processing
 BATCH_SIZE = 50
 MAX_WORKERS = 4  # for parallel processing
+CHEMBL_MAX_WORKERS = 16  # concurrent ChEMBL lookups, which are network-bound
 
 # Cache Configuration
 CACHE_DIR = Path(os.path.expanduser("~")) / ".chemical_data_collector" / "cache"
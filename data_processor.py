@@ -1,10 +1,17 @@
 """Data processing with batch operations and parallel execution."""
 
+import atexit
 import concurrent.futures
+import logging
+import threading
+from itertools import repeat
+from operator import attrgetter
 from pathlib import Path
-from dataclasses import asdict
-from typing import Any, Dict, List, Optional
+from dataclasses import fields
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, List, Optional, Sequence
 import pandas as pd
+from rdkit import Chem
 from tqdm import tqdm
 
 from binding_data_processor import BindingDataProcessor
@@ -14,12 +21,152 @@ from api_client import PubChemClient, PubMedClient
 from cache_manager import CacheManager
 from config import BATCH_SIZE, DATA_SOURCES, IDENTIFIER_FIELDS, MAX_WORKERS
 from logger import LogManager
-from models import CompoundData, ValidationError
+from models import _CAS_PATTERN, CompoundData, ValidationError
+
+# Identifier values of a compound as one tuple, and the values that count
+# as a missing identifier
+_IDENTIFIERS = attrgetter(*IDENTIFIER_FIELDS)
+_MISSING = frozenset({None, "", "N/A"})
+
+# Every field of a compound, in declaration order
+_COMPOUND_FIELDS = tuple(f.name for f in fields(CompoundData))
+_COMPOUND_FIELD_SET = frozenset(_COMPOUND_FIELDS)
+
+# Fields written to the output file, as one tuple. The per-target activity
+# type, source, DOI and PMID fields are kept in memory only, as they were
+# before CompoundData declared them
+_UNEXPORTED_TARGET_FIELDS = ('activity_type', 'source', 'doi', 'pmid')
+_EXPORTED_FIELDS = tuple(
+    name for name in _COMPOUND_FIELDS
+    if not (
+        name.startswith('target_')
+        and name.endswith(_UNEXPORTED_TARGET_FIELDS)
+    )
+)
+_EXPORTED_VALUES = attrgetter(*_EXPORTED_FIELDS)
+
+# Container fields compounds share read-only empty defaults for until first
+# written, and the writable types those defaults are exported as
+_CONTAINER_FIELDS = ('other_names', 'data_sources', 'legal_status', 'scheduling')
+_EXPORTED_CONTAINERS = {frozenset: set, MappingProxyType: dict}
+
+# Ranked common names kept per compound (common_name_1 to common_name_3)
+COMMON_NAME_SLOTS = 3
+
+
+def _set_fields(compound: CompoundData, values: Dict[str, Any]) -> None:
+    """
+    Copy values onto a compound's fields.
+    
+    CompoundData has slots, so keys that aren't fields (extra computed
+    properties, for example) are skipped rather than added as attributes.
+    
+    Args:
+        compound: Compound to update
+        values: New values keyed by field name
+    """
+    for key, value in values.items():
+        if key in _COMPOUND_FIELD_SET:
+            setattr(compound, key, value)
+
+
+# Compound fields filled from PubChem data, with their PubChem keys
+_PUBCHEM_FIELDS = (
+    ("iupac_name", "IUPACName"),
+    ("inchi", "InChI"),
+    ("inchi_key", "InChIKey"),
+    ("pubchem_url", "pubchem_url"),
+)
+
+
+def _pubchem_cid(compound: CompoundData) -> Optional[str]:
+    """
+    Get a compound's PubChem CID as a string.
+    
+    Args:
+        compound: Compound to read
+        
+    Returns:
+        CID, or None if the compound has no valid CID
+    """
+    cid = compound.pubchem_cid
+    # Read from a CSV column with gaps, CIDs arrive as floats (NaN if absent)
+    if isinstance(cid, float):
+        return str(int(cid)) if cid == cid else None
+    cid = str(cid).strip()
+    return cid if cid.isdigit() else None
+
+
+def _compounds_frame(compounds: List[CompoundData]) -> pd.DataFrame:
+    """
+    Build a DataFrame with one row per compound.
+    
+    Args:
+        compounds: Compounds to convert
+        
+    Returns:
+        DataFrame with one column per exported CompoundData field
+    """
+    # Transpose the per-compound value tuples into columns; unlike asdict
+    # this doesn't deep-copy every set and dict field
+    columns = dict(zip(_EXPORTED_FIELDS, zip(*map(_EXPORTED_VALUES, compounds))))
+
+    # Export the shared empty defaults as the set and dict they stand for
+    for name in _CONTAINER_FIELDS:
+        if name in columns:
+            columns[name] = [
+                _EXPORTED_CONTAINERS[type(value)](value)
+                if type(value) in _EXPORTED_CONTAINERS else value
+                for value in columns[name]
+            ]
+    return pd.DataFrame(columns)
+
+
+def _invalid_rows(chunk: pd.DataFrame) -> pd.Series:
+    """
+    Find input rows that CompoundData validation would reject.
+    
+    Checks a whole chunk at once with column operations, so its compounds
+    can be created without validating each one.
+    
+    Args:
+        chunk: Rows read from the input file
+        
+    Returns:
+        Boolean mask, True for rows that fail validation
+    """
+    invalid = pd.Series(False, index=chunk.index)
+
+    # CAS numbers must match the pattern and their check digit
+    if 'cas' in chunk:
+        cas = chunk['cas']
+        cas = cas[cas.notna() & (cas != "N/A")].astype(str)
+        parts = cas.str.extract(_CAS_PATTERN)
+        registry = parts[0] + parts[1]
+        total = sum(
+            weight * pd.to_numeric(registry.str[-weight]).fillna(0)
+            for weight in range(1, 10)
+        )
+        bad_cas = parts[0].isna() | (total % 10 != pd.to_numeric(parts[2]))
+        invalid |= bad_cas.reindex(chunk.index, fill_value=False)
+
+    # Molecular weight and binding affinities can't be negative
+    for column in ['molecular_weight'] + [
+        f'target_{i}_affinity' for i in range(1, 13)
+    ]:
+        if column in chunk:
+            invalid |= pd.to_numeric(chunk[column], errors='coerce') < 0
+
+    return invalid
 
 
 class DataProcessor:
     """Handles batch processing and parallel execution of data collection."""
 
+    # One worker pool shared by every batch and processor instance
+    _executor: ClassVar[Optional[concurrent.futures.ThreadPoolExecutor]] = None
+    _executor_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(self):
         """Initialize data processor."""
         self.logger = LogManager().get_logger("data_processor")
@@ -45,14 +192,7 @@ class DataProcessor:
         errors = []
 
         # Check that at least one identifier is present
-        has_identifier = False
-        for field in IDENTIFIER_FIELDS:
-            value = getattr(compound, field)
-            if value is not None and value != "N/A" and value != "":
-                has_identifier = True
-                break
-
-        if not has_identifier:
+        if all(value in _MISSING for value in _IDENTIFIERS(compound)):
             errors.append("At least one identifier (CAS, name, or SMILES) is required")
 
         # Validate structure if SMILES present
@@ -63,10 +203,52 @@ class DataProcessor:
 
         return errors
 
+    def validate_compound_fast(self, compound: CompoundData) -> Optional[str]:
+        """
+        Check a compound, stopping at the first problem.
+        
+        Runs the same checks as validate_compound, cheapest first, so
+        rejected compounds skip structure validation when they can.
+        
+        Args:
+            compound: Compound data to validate
+            
+        Returns:
+            First validation error message, or None if valid
+        """
+        if all(value in _MISSING for value in _IDENTIFIERS(compound)):
+            return "At least one identifier (CAS, name, or SMILES) is required"
+
+        if compound.smiles != "N/A":
+            is_valid, error = self.chemical_properties.validate_structure(compound.smiles)
+            if not is_valid:
+                return f"Invalid structure: {error}"
+
+        return None
+
+    @classmethod
+    def _get_executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Get the shared worker pool, creating it on first use.
+        
+        Returns:
+            Thread pool for processing compounds
+        """
+        with cls._executor_lock:
+            if cls._executor is None:
+                # A batch never has more than BATCH_SIZE compounds in flight
+                cls._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(MAX_WORKERS, BATCH_SIZE),
+                    thread_name_prefix="data_processor"
+                )
+                atexit.register(cls._executor.shutdown, wait=True)
+            return cls._executor
+
     def process_batch(
         self,
         compounds: List[CompoundData],
-        sources: Optional[List[str]] = None
+        sources: Optional[List[str]] = None,
+        mols: Optional[List[Optional[Chem.Mol]]] = None
     ) -> List[CompoundData]:
         """
         Process a batch of compounds.
@@ -74,6 +256,7 @@ class DataProcessor:
         Args:
             compounds: List of compounds to process
             sources: Optional list of data sources to use
+            mols: Optional molecules already parsed from the compounds' SMILES
             
         Returns:
             List of processed compounds
@@ -83,112 +266,170 @@ class DataProcessor:
                 source for source, config in DATA_SOURCES.items()
                 if config['enabled']
             ]
+        # Order sources by priority once for the whole batch
+        sources = tuple(sorted(sources, key=lambda s: DATA_SOURCES[s]['priority']))
 
-        processed = []
-        errors = []
+        # Identifiers from PubChem for every compound with a CID at once
+        if 'pubchem' in sources:
+            self._enrich_from_pubchem(compounds)
 
-        # Process compounds in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_compound = {
-                executor.submit(
-                    self._process_single_compound, compound, sources
-                ): compound
-                for compound in compounds
-            }
-
-            for future in concurrent.futures.as_completed(future_to_compound):
-                compound = future_to_compound[future]
-                try:
-                    result = future.result()
-                    if result:
-                        processed.append(result)
-                except Exception as e:
-                    self.logger.error(
-                        f"Error processing compound {compound.name}: {str(e)}"
-                    )
-                    errors.append((compound, str(e)))
+        if mols is None:
+            mols = repeat(None)
+
+        # Process compounds in parallel; results come back in input order,
+        # with None for compounds that failed (already logged)
+        results = self._get_executor().map(
+            self._process_single_compound, compounds, repeat(sources), mols
+        )
+        processed = []
+        failed = []
+        for compound, result in zip(compounds, results):
+            if result is None:
+                failed.append(compound)
+            else:
+                processed.append(result)
 
-        # Log errors summary
-        if errors:
+        # Log errors summary; the name list is only built if it'll be logged
+        if failed and self.logger.isEnabledFor(logging.WARNING):
             self.logger.warning(
-                f"Failed to process {len(errors)} compounds:"
-                f"\n" + "\n".join(
-                    f"- {c.name}: {e}" for c, e in errors
-                )
+                "Failed to process %d compounds:\n%s",
+                len(failed), "\n".join(f"- {c.name}" for c in failed)
             )
 
         return processed
 
+    def _enrich_from_pubchem(self, compounds: List[CompoundData]) -> None:
+        """
+        Fill in missing identifiers from PubChem for compounds with a CID.
+        
+        Args:
+            compounds: Compounds to enrich in place
+        """
+        by_cid: Dict[str, List[CompoundData]] = {}
+        for compound in compounds:
+            cid = _pubchem_cid(compound)
+            if cid is not None:
+                by_cid.setdefault(cid, []).append(compound)
+        if not by_cid:
+            return
+
+        try:
+            results = self.pubchem.get_compounds_by_cids(list(by_cid))
+        except Exception as e:
+            self.logger.error("Error fetching PubChem data: %s", e)
+            return
+
+        for cid, data in results.items():
+            for compound in by_cid[cid]:
+                for field, key in _PUBCHEM_FIELDS:
+                    if getattr(compound, field) in _MISSING and data.get(key):
+                        setattr(compound, field, data[key])
+                compound.add_names(data.get('synonyms', ()))
+                compound.add_sources(('pubchem',))
+
     def _process_single_compound(
         self,
         compound: CompoundData,
-        sources: List[str]
+        sources: Sequence[str],
+        mol: Optional[Chem.Mol] = None
     ) -> Optional[CompoundData]:
         """
         Process a single compound using specified data sources.
         
         Args:
             compound: Compound to process
-            sources: List of data sources to use
+            sources: Data sources to use, in priority order
+            mol: Optional molecule already parsed from the compound's SMILES
             
         Returns:
             Processed compound or None if processing failed
         """
         try:
             # Validate input
-            errors = self.validate_compound(compound)
-            if errors:
-                raise ValidationError(
-                    f"Validation failed for {compound.name}: {', '.join(errors)}"
-                )
+            error = self.validate_compound_fast(compound)
+            if error:
+                raise ValidationError(f"Validation failed for {compound.name}: {error}")
 
             # Calculate chemical properties if SMILES available
             if compound.smiles != "N/A":
-                props = self.chemical_properties.calculate_properties(compound.smiles)
+                props = self.chemical_properties.calculate_properties(
+                    compound.smiles, mol=mol
+                )
                 if props:
-                    for key, value in props.items():
-                        setattr(compound, key, value)
+                    _set_fields(compound, props)
 
             # Rank common names by search results
-            common_names = self.web_enrichment.get_common_names(compound.name)
-            for i, name_data in enumerate(common_names, 1):
+            common_names = self.cache.memoize(
+                'web.common_names', compound.name,
+                lambda: self.web_enrichment.get_common_names(compound.name)
+            )
+            for i, name_data in enumerate(common_names[:COMMON_NAME_SLOTS], 1):
                 setattr(compound, f'common_name_{i}', name_data['name'])
-                setattr(compound, f'common_name_{i}_source', name_data['source'])
-                setattr(compound, f'common_name_{i}_relevance', name_data['relevance'])
 
             # Sort and enrich binding data
             self.binding_processor.sort_binding_data(compound)
 
             # Get legal status
-            legal_status = self.web_enrichment.get_legal_status(compound.name)
+            legal_status = self.cache.memoize(
+                'web.legal_status', compound.name,
+                lambda: self.web_enrichment.get_legal_status(compound.name)
+            )
             if legal_status:
-                compound.scheduling.update(
+                compound.update_scheduling(
                     {s['jurisdiction']: s['schedule'] for s in legal_status['scheduling']}
                 )
-                compound.data_sources.update(legal_status['sources'])
+                compound.add_sources(legal_status['sources'])
 
             # Get pharmacology
-            pharm_info = self.web_enrichment.get_pharmacology(compound.name)
+            pharm_info = self.cache.memoize(
+                'web.pharmacology', compound.name,
+                lambda: self.web_enrichment.get_pharmacology(compound.name)
+            )
             if pharm_info:
                 if pharm_info['mechanism_of_action']:
                     compound.mechanism_of_action = '; '.join(pharm_info['mechanism_of_action'])
                 if pharm_info['toxicity']:
                     compound.toxicity = '; '.join(pharm_info['toxicity'])
-                compound.data_sources.update(pharm_info['sources'])
+                compound.add_sources(pharm_info['sources'])
 
             # Get reference URLs
-            urls = self.web_enrichment.get_reference_urls(compound.name)
-            for key, value in urls.items():
-                setattr(compound, key, value)
+            urls = self.cache.memoize(
+                'web.reference_urls', compound.name,
+                lambda: self.web_enrichment.get_reference_urls(compound.name)
+            )
+            _set_fields(compound, urls.get('urls', {}))
 
             return compound
 
         except Exception as e:
-            self.logger.error(
-                f"Error processing compound {compound.name}: {str(e)}"
-            )
+            self.logger.error("Error processing compound %s: %s", compound.name, e)
             return None
 
+    def _parse_structures(
+        self,
+        compounds: List[CompoundData]
+    ) -> List[Optional[Chem.Mol]]:
+        """
+        Parse the SMILES of a batch of compounds on RDKit's parser threads.
+        
+        Args:
+            compounds: Compounds to parse
+            
+        Returns:
+            Molecules in compound order (None where no SMILES was parsed)
+        """
+        with_smiles = [
+            i for i, compound in enumerate(compounds)
+            if compound.smiles != "N/A"
+        ]
+        parsed = self.chemical_properties.parse_smiles_batch(
+            [compounds[i].smiles for i in with_smiles]
+        )
+        mols: List[Optional[Chem.Mol]] = [None] * len(compounds)
+        for i, mol in zip(with_smiles, parsed):
+            mols[i] = mol
+        return mols
+
     def process_file(
         self,
         input_file: str,
@@ -207,55 +448,66 @@ class DataProcessor:
             Processing statistics
         """
         # Determine file format from extension
-        input_ext = Path(input_file).suffix.lower()
-        output_ext = Path(output_file).suffix.lower()
-        
-        # Read input file
-        if input_ext == '.tsv':
-            df = pd.read_csv(input_file, sep='\t')
-        else:
-            df = pd.read_csv(input_file)
-            
-        compounds = [
-            CompoundData(**row)
-            for _, row in df.iterrows()
-        ]
+        input_sep = '\t' if Path(input_file).suffix.lower() == '.tsv' else ','
+        output_sep = '\t' if Path(output_file).suffix.lower() == '.tsv' else ','
 
-        # Process in batches
-        processed = []
-        for i in tqdm(
-            range(0, len(compounds), BATCH_SIZE),
-            desc="Processing compounds"
-        ):
-            batch = compounds[i:i + BATCH_SIZE]
-            processed.extend(self.process_batch(batch, sources))
-
-        # Save results
-        result_df = pd.DataFrame([
-            asdict(compound) for compound in processed
-        ])
-        
-        # Save in appropriate format
-        if output_ext == '.tsv':
-            result_df.to_csv(output_file, sep='\t', index=False)
-        else:
-            result_df.to_csv(output_file, index=False)
+        # Stream the input one batch at a time, appending each processed
+        # batch to the output, so memory stays bounded by BATCH_SIZE
+        total_compounds = 0
+        processed_compounds = 0
+        sources_used = set()
+        missing_identifiers = 0
+        header_written = False
+        reader = pd.read_csv(input_file, sep=input_sep, chunksize=BATCH_SIZE)
+        with open(output_file, 'w', newline='') as out, tqdm(
+            desc="Processing compounds", unit="compounds"
+        ) as progress:
+            for chunk in reader:
+                total_compounds += len(chunk)
+                progress.update(len(chunk))
+                columns = list(chunk.columns)
 
-        # Calculate statistics
-        stats = {
-            'total_compounds': len(compounds),
-            'processed_compounds': len(processed),
-            'success_rate': len(processed) / len(compounds) * 100,
-            'sources_used': set().union(*(
-                c.data_sources for c in processed
-            )),
-            'missing_identifiers': sum(
-                1 for c in processed
-                if any(
-                    getattr(c, f) == "N/A"
-                    for f in IDENTIFIER_FIELDS
+                # Validate the whole chunk at once, logging why each
+                # rejected row failed
+                invalid = _invalid_rows(chunk)
+                if invalid.any():
+                    for row in chunk[invalid].itertuples(index=False, name=None):
+                        try:
+                            CompoundData(**dict(zip(columns, row)))
+                        except ValidationError as e:
+                            self.logger.warning("Skipping invalid row: %s", e)
+                    chunk = chunk[~invalid]
+
+                # itertuples yields plain tuples rather than a Series per row
+                with CompoundData.bulk_load():
+                    batch = [
+                        CompoundData(**dict(zip(columns, row)))
+                        for row in chunk.itertuples(index=False, name=None)
+                    ]
+                processed = self.process_batch(
+                    batch, sources, self._parse_structures(batch)
                 )
-            )
+
+                # Save results
+                if processed:
+                    _compounds_frame(processed).to_csv(
+                        out, sep=output_sep, header=not header_written, index=False
+                    )
+                    header_written = True
+
+                # Accumulate statistics
+                processed_compounds += len(processed)
+                for compound in processed:
+                    sources_used.update(compound.data_sources)
+                    if "N/A" in _IDENTIFIERS(compound):
+                        missing_identifiers += 1
+
+        stats = {
+            'total_compounds': total_compounds,
+            'processed_compounds': processed_compounds,
+            'success_rate': processed_compounds / total_compounds * 100,
+            'sources_used': sources_used,
+            'missing_identifiers': missing_identifiers
         }
 
         self.logger.info(
@@ -1,8 +1,13 @@
 """Logging configuration and utilities."""
 
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import (
+    MemoryHandler, QueueHandler, QueueListener, TimedRotatingFileHandler
+)
 from pathlib import Path
 from typing import Optional
 
@@ -44,18 +49,40 @@ class LogManager:
         
         # File handler with daily rotation
         log_file = self.log_dir / f"chemical_data_{datetime.now():%Y%m%d}.log"
-        file_handler = logging.FileHandler(log_file)
+        file_handler = TimedRotatingFileHandler(
+            log_file, when='midnight', backupCount=30
+        )
         file_handler.setFormatter(formatter)
         file_handler.setLevel(LOG_LEVEL)
         
+        # Buffer file writes so records reach the disk in batches; errors
+        # are written at once
+        self._file_buffer = MemoryHandler(
+            capacity=1024,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        )
+        
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
         console_handler.setLevel(LOG_LEVEL)
         
-        # Add handlers to logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Records are queued by the calling thread and written by a single
+        # listener thread, so worker threads never block on file or console I/O
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(log_queue))
+        self._listener = QueueListener(
+            log_queue, self._file_buffer, console_handler, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self._shutdown)
+
+    def _shutdown(self):
+        """Write out queued and buffered records at exit."""
+        self._listener.stop()
+        self._file_buffer.flush()
 
     def get_logger(self, name: str = None) -> logging.Logger:
         """
@@ -1,9 +1,27 @@
 """Data models and validation logic."""
 
-from dataclasses import dataclass, field
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Set
+from operator import attrgetter
+from types import MappingProxyType
+from typing import AbstractSet, Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+
+# Shared empty defaults for CompoundData's container fields; a compound gets
+# its own container only when one is first written (see CompoundData.add_names)
+_NO_VALUES: AbstractSet[Any] = frozenset()
+_NO_ENTRIES: Mapping[str, Any] = MappingProxyType({})
+
+# CAS Registry Number: registry digits, then the check digit
+_CAS_PATTERN = re.compile(r'^(\d{1,7})-(\d{2})-(\d)$', re.ASCII)
+
+# Whether new CompoundData instances validate themselves; switched off in
+# the current thread by CompoundData.bulk_load()
+_VALIDATE: ContextVar[bool] = ContextVar('validate_compounds', default=True)
 
 
 class CompoundType(Enum):
@@ -24,7 +42,7 @@ class LegalStatus(Enum):
     UNSCHEDULED = "unscheduled"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BindingData:
     """Represents binding affinity data for a compound-target interaction."""
     target_common_name: str = "N/A"
@@ -38,7 +56,86 @@ class BindingData:
     confidence_score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
+class AssayConditions:
+    """Assay conditions reported with a BindingDB affinity measurement."""
+    pH: Any = "N/A"
+    temperature: Any = "N/A"
+    source: Any = "N/A"
+
+
+@dataclass(slots=True)
+class Kinetics:
+    """Binding kinetics reported by BindingDB."""
+    kon: str = "N/A"
+    koff: str = "N/A"
+
+
+@dataclass(slots=True)
+class LigandIdentifiers:
+    """External database identifiers for a BindingDB ligand."""
+    pubchem_cid: str = "N/A"
+    pubchem_sid: str = "N/A"
+    pubchem_aid: str = "N/A"
+    chembl_id: str = "N/A"
+    chebi_id: str = "N/A"
+    drugbank_id: str = "N/A"
+    iuphar_id: str = "N/A"
+    kegg_id: str = "N/A"
+    zinc_id: str = "N/A"
+    pdb_het: str = "N/A"
+    pdb_complexes: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class LigandReferences:
+    """Literature and BindingDB references for a ligand-target pair."""
+    doi: str = "N/A"
+    pmid: str = "N/A"
+    authors: str = "N/A"
+    institution: str = "N/A"
+    bindingdb_ligand: str = "N/A"
+    bindingdb_target: str = "N/A"
+    bindingdb_pair: str = "N/A"
+
+
+@dataclass(slots=True)
+class CompoundRecord:
+    """Represents a receptor ligand gathered from BindingDB.
+    
+    Converted to a plain dictionary with dataclasses.asdict() when
+    checkpointed or exported.
+    """
+    name: str
+    original_name: str
+    smiles: str
+    inchi: str
+    inchi_key: str
+    affinity_type: str
+    affinity_value: float
+    affinity_modifier: str
+    assay_conditions: AssayConditions
+    activity_type: str
+    target: str
+    target_gene: str
+    kinetics: Kinetics
+    identifiers: LigandIdentifiers
+    references: LigandReferences
+    cas_number: Optional[str]
+    patent_number: str
+    reference_urls: Dict[str, Any]
+    matching_patterns: List[str]
+    species: str
+    data_source: str
+    affinity_unit: str = "nM"
+    common_names: List[str] = field(default_factory=list)
+    legal_status: Dict[str, Any] = field(default_factory=dict)
+    pharmacology: Dict[str, Any] = field(default_factory=dict)
+    patents: List[Dict[str, Any]] = field(default_factory=list)
+    patent_count: int = 0
+
+
+@dataclass(slots=True)
 class CompoundData:
     """Represents comprehensive chemical compound data."""
     # Core identifiers
@@ -50,7 +147,7 @@ class CompoundData:
     common_name_1_results: int = 0  # Number of search results for name 1
     common_name_2_results: int = 0  # Number of search results for name 2
     common_name_3_results: int = 0  # Number of search results for name 3
-    other_names: Set[str] = field(default_factory=set)  # Additional names
+    other_names: AbstractSet[str] = _NO_VALUES  # Additional names
     iupac_name: str = "N/A"
     compound_type: CompoundType = CompoundType.OTHER
     
@@ -73,6 +170,10 @@ class CompoundData:
     target_1_affinity_unit: str = "N/A"
     target_1_affinity_type: str = "N/A"
     target_1_pubmed_results: int = 0
+    target_1_activity_type: str = "unknown"
+    target_1_source: str = "N/A"
+    target_1_doi: str = "N/A"
+    target_1_pmid: str = "N/A"
     
     target_2_common_name: str = "N/A"
     target_2_protein_name: str = "N/A"
@@ -81,6 +182,10 @@ class CompoundData:
     target_2_affinity_unit: str = "N/A"
     target_2_affinity_type: str = "N/A"
     target_2_pubmed_results: int = 0
+    target_2_activity_type: str = "unknown"
+    target_2_source: str = "N/A"
+    target_2_doi: str = "N/A"
+    target_2_pmid: str = "N/A"
     
     target_3_common_name: str = "N/A"
     target_3_protein_name: str = "N/A"
@@ -89,6 +194,10 @@ class CompoundData:
     target_3_affinity_unit: str = "N/A"
     target_3_affinity_type: str = "N/A"
     target_3_pubmed_results: int = 0
+    target_3_activity_type: str = "unknown"
+    target_3_source: str = "N/A"
+    target_3_doi: str = "N/A"
+    target_3_pmid: str = "N/A"
     
     target_4_common_name: str = "N/A"
     target_4_protein_name: str = "N/A"
@@ -97,6 +206,10 @@ class CompoundData:
     target_4_affinity_unit: str = "N/A"
     target_4_affinity_type: str = "N/A"
     target_4_pubmed_results: int = 0
+    target_4_activity_type: str = "unknown"
+    target_4_source: str = "N/A"
+    target_4_doi: str = "N/A"
+    target_4_pmid: str = "N/A"
     
     target_5_common_name: str = "N/A"
     target_5_protein_name: str = "N/A"
@@ -105,6 +218,10 @@ class CompoundData:
     target_5_affinity_unit: str = "N/A"
     target_5_affinity_type: str = "N/A"
     target_5_pubmed_results: int = 0
+    target_5_activity_type: str = "unknown"
+    target_5_source: str = "N/A"
+    target_5_doi: str = "N/A"
+    target_5_pmid: str = "N/A"
     
     target_6_common_name: str = "N/A"
     target_6_protein_name: str = "N/A"
@@ -113,6 +230,10 @@ class CompoundData:
     target_6_affinity_unit: str = "N/A"
     target_6_affinity_type: str = "N/A"
     target_6_pubmed_results: int = 0
+    target_6_activity_type: str = "unknown"
+    target_6_source: str = "N/A"
+    target_6_doi: str = "N/A"
+    target_6_pmid: str = "N/A"
     
     target_7_common_name: str = "N/A"
     target_7_protein_name: str = "N/A"
@@ -121,6 +242,10 @@ class CompoundData:
     target_7_affinity_unit: str = "N/A"
     target_7_affinity_type: str = "N/A"
     target_7_pubmed_results: int = 0
+    target_7_activity_type: str = "unknown"
+    target_7_source: str = "N/A"
+    target_7_doi: str = "N/A"
+    target_7_pmid: str = "N/A"
     
     target_8_common_name: str = "N/A"
     target_8_protein_name: str = "N/A"
@@ -129,6 +254,10 @@ class CompoundData:
     target_8_affinity_unit: str = "N/A"
     target_8_affinity_type: str = "N/A"
     target_8_pubmed_results: int = 0
+    target_8_activity_type: str = "unknown"
+    target_8_source: str = "N/A"
+    target_8_doi: str = "N/A"
+    target_8_pmid: str = "N/A"
     
     target_9_common_name: str = "N/A"
     target_9_protein_name: str = "N/A"
@@ -137,6 +266,10 @@ class CompoundData:
     target_9_affinity_unit: str = "N/A"
     target_9_affinity_type: str = "N/A"
     target_9_pubmed_results: int = 0
+    target_9_activity_type: str = "unknown"
+    target_9_source: str = "N/A"
+    target_9_doi: str = "N/A"
+    target_9_pmid: str = "N/A"
     
     target_10_common_name: str = "N/A"
     target_10_protein_name: str = "N/A"
@@ -145,6 +278,10 @@ class CompoundData:
     target_10_affinity_unit: str = "N/A"
     target_10_affinity_type: str = "N/A"
     target_10_pubmed_results: int = 0
+    target_10_activity_type: str = "unknown"
+    target_10_source: str = "N/A"
+    target_10_doi: str = "N/A"
+    target_10_pmid: str = "N/A"
     
     target_11_common_name: str = "N/A"
     target_11_protein_name: str = "N/A"
@@ -153,6 +290,10 @@ class CompoundData:
     target_11_affinity_unit: str = "N/A"
     target_11_affinity_type: str = "N/A"
     target_11_pubmed_results: int = 0
+    target_11_activity_type: str = "unknown"
+    target_11_source: str = "N/A"
+    target_11_doi: str = "N/A"
+    target_11_pmid: str = "N/A"
     
     target_12_common_name: str = "N/A"
     target_12_protein_name: str = "N/A"
@@ -161,6 +302,10 @@ class CompoundData:
     target_12_affinity_unit: str = "N/A"
     target_12_affinity_type: str = "N/A"
     target_12_pubmed_results: int = 0
+    target_12_activity_type: str = "unknown"
+    target_12_source: str = "N/A"
+    target_12_doi: str = "N/A"
+    target_12_pmid: str = "N/A"
     
     # Pharmacology & activity
     primary_activity: str = "N/A"
@@ -170,8 +315,12 @@ class CompoundData:
     metabolism: str = "N/A"
     
     # Legal & classification
-    legal_status: Dict[str, LegalStatus] = field(default_factory=dict)  # Country -> Status
-    scheduling: Dict[str, str] = field(default_factory=dict)  # Country/Region -> Schedule
+    legal_status: Mapping[str, LegalStatus] = field(
+        default_factory=lambda: _NO_ENTRIES
+    )  # Country -> Status
+    scheduling: Mapping[str, str] = field(
+        default_factory=lambda: _NO_ENTRIES
+    )  # Country/Region -> Schedule
     
     # Database identifiers
     pubchem_cid: str = "N/A"
@@ -193,7 +342,7 @@ class CompoundData:
     # Additional metadata
     description: str = "N/A"
     primary_target: str = "N/A"
-    data_sources: Set[str] = field(default_factory=set)  # Track where data came from
+    data_sources: AbstractSet[str] = _NO_VALUES  # Track where data came from
     last_updated: str = field(
         default_factory=lambda: datetime.now().isoformat()
     )
@@ -206,7 +355,23 @@ class CompoundData:
     
     def __post_init__(self):
         """Validate data after initialization."""
-        self._validate()
+        if _VALIDATE.get():
+            self._validate()
+
+    @staticmethod
+    @contextmanager
+    def bulk_load() -> Iterator[None]:
+        """
+        Create compounds without validating each one.
+        
+        For bulk ingest that validates all rows in one pass instead; only
+        affects compounds created in the current thread.
+        """
+        token = _VALIDATE.set(False)
+        try:
+            yield
+        finally:
+            _VALIDATE.reset(token)
 
     def _validate(self):
         """Validate compound data."""
@@ -240,21 +405,44 @@ class CompoundData:
         Returns:
             True if valid, False otherwise
         """
-        import re
-        pattern = r'^\d{1,7}-\d{2}-\d$'
-        if not re.match(pattern, cas):
+        match = _CAS_PATTERN.match(cas)
+        if match is None:
             return False
             
-        # Validate checksum
-        numbers = cas.replace('-', '')
-        check_digit = int(numbers[-1])
-        numbers = numbers[:-1]
+        # Validate checksum: registry digits weighted 1, 2, ... from the
+        # right, taken straight from their ASCII codes
+        digits = (match[1] + match[2]).encode('ascii')
+        check_digit = int(match[3])
         total = sum(
-            int(num) * (i + 1) 
-            for i, num in enumerate(reversed(numbers))
+            weight * (digit - 48)
+            for weight, digit in enumerate(reversed(digits), 1)
         )
         return (total % 10) == check_digit
 
+    def add_names(self, names: Iterable[str]) -> None:
+        """Add alternative names, copying the shared empty default first."""
+        if isinstance(self.other_names, frozenset):
+            self.other_names = set(self.other_names)
+        self.other_names.update(names)
+
+    def add_sources(self, sources: Iterable[str]) -> None:
+        """Record data sources, copying the shared empty default first."""
+        if isinstance(self.data_sources, frozenset):
+            self.data_sources = set(self.data_sources)
+        self.data_sources.update(sources)
+
+    def update_legal_status(self, legal_status: Mapping[str, LegalStatus]) -> None:
+        """Update legal statuses, copying the shared empty default first."""
+        if not isinstance(self.legal_status, dict):
+            self.legal_status = dict(self.legal_status)
+        self.legal_status.update(legal_status)
+
+    def update_scheduling(self, scheduling: Mapping[str, str]) -> None:
+        """Update schedules, copying the shared empty default first."""
+        if not isinstance(self.scheduling, dict):
+            self.scheduling = dict(self.scheduling)
+        self.scheduling.update(scheduling)
+
     def merge(self, other: 'CompoundData') -> None:
         """
         Merge data from another compound instance.
@@ -275,12 +463,12 @@ class CompoundData:
             self.common_name_3 = other.common_name_3
             self.common_name_3_results = other.common_name_3_results
             
-        self.other_names.update(other.other_names)
-        self.data_sources.update(other.data_sources)
+        self.add_names(other.other_names)
+        self.add_sources(other.data_sources)
         
         # Merge dictionaries
-        self.legal_status.update(other.legal_status)
-        self.scheduling.update(other.scheduling)
+        self.update_legal_status(other.legal_status)
+        self.update_scheduling(other.scheduling)
         
         # Merge binding data
         for i in range(1, 13):
@@ -289,31 +477,30 @@ class CompoundData:
                 # Copy all target fields if the other has more PubMed results
                 for field in ['common_name', 'protein_name', 'gene_name', 
                             'affinity', 'affinity_unit', 'affinity_type', 
-                            'pubmed_results']:
+                            'pubmed_results', 'activity_type', 'source',
+                            'doi', 'pmid']:
                     setattr(self, f'target_{i}_{field}',
                            getattr(other, f'target_{i}_{field}'))
         
         # Update scalar fields if they have values
-        excluded_fields = {'other_names', 'data_sources', 'legal_status', 'scheduling'}
-        excluded_prefixes = ['common_name_', 'target_']
-        
-        def is_excluded_field(name: str) -> bool:
-            """Check if field should be excluded from updates."""
-            if name in excluded_fields:
-                return True
-            return any(name.startswith(prefix) for prefix in excluded_prefixes)
-        
-        # Update non-excluded fields
-        for name, _ in self.__dataclass_fields__.items():
-            if not is_excluded_field(name):
-                other_value = getattr(other, name)
-                if other_value != "N/A" and other_value is not None:
-                    setattr(self, name, other_value)
-                    
+        for name, other_value in zip(_MERGED_SCALAR_FIELDS, _merged_scalars(other)):
+            if other_value != "N/A" and other_value is not None:
+                setattr(self, name, other_value)
+                
         # Update timestamp
         self.last_updated = datetime.now().isoformat()
 
 
+# Fields merge copies whenever the other compound has a value; names, sources,
+# legal data and the ranked name and target blocks are merged separately
+_MERGED_SCALAR_FIELDS = tuple(
+    f.name for f in fields(CompoundData)
+    if f.name not in {'other_names', 'data_sources', 'legal_status', 'scheduling'}
+    and not f.name.startswith(('common_name_', 'target_'))
+)
+_merged_scalars = attrgetter(*_MERGED_SCALAR_FIELDS)
+
+
 class ValidationError(Exception):
     """Raised when compound data validation fails."""
     pass
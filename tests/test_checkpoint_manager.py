@@ -0,0 +1,59 @@
+"""Tests for checkpoint management."""
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from checkpoint_manager import CheckpointManager
+
+
+def _interrupted_run(base_dir):
+    manager = CheckpointManager(str(base_dir))
+    assert not manager.begin_run("gather_ligands")
+    manager.save_checkpoint("find_targets", [{"target": "5-HT2A"}])
+    manager.append_record("process_compounds", {"inchi_key": "A"})
+    manager.append_record("process_compounds", {"inchi_key": "B"})
+    manager.close_records("process_compounds")
+    # Simulate a crash halfway through writing the next record
+    with open(manager._get_records_path("process_compounds"), "ab") as f:
+        f.write(b'{"inchi_key": "C"')
+    return manager
+
+
+def test_interrupted_run_resumes_from_records(tmp_path):
+    _interrupted_run(tmp_path)
+
+    manager = CheckpointManager(str(tmp_path))
+    assert manager.begin_run("gather_ligands")
+    assert manager.is_step_completed("find_targets")
+    assert manager.load_records("process_compounds") == [
+        {"inchi_key": "A"},
+        {"inchi_key": "B"},
+    ]
+
+    manager.append_record("process_compounds", {"inchi_key": "C"})
+    manager.close_records("process_compounds")
+    assert [r["inchi_key"] for r in manager.load_records("process_compounds")] == [
+        "A",
+        "B",
+        "C",
+    ]
+
+
+def test_completed_run_starts_over(tmp_path):
+    manager = _interrupted_run(tmp_path)
+    manager.save_checkpoint("gather_ligands", [{"inchi_key": "A"}])
+
+    manager = CheckpointManager(str(tmp_path))
+    assert not manager.begin_run("gather_ligands")
+    assert not manager.is_step_completed("find_targets")
+    assert manager.load_records("process_compounds") == []
+
+
+def test_fresh_run_discards_interrupted_run(tmp_path):
+    _interrupted_run(tmp_path)
+
+    manager = CheckpointManager(str(tmp_path))
+    assert not manager.begin_run("gather_ligands", fresh=True)
+    assert manager.load_records("process_compounds") == []
@@ -0,0 +1,55 @@
+"""Tests for chemical property calculations."""
+
+import math
+
+import pytest
+
+pytest.importorskip("rdkit")
+
+from rdkit import Chem
+from rdkit.Chem import AllChem
+
+from chemical_properties import ChemicalProperties
+
+
+def test_parse_smiles_batch_keeps_input_order():
+    smiles = ["CCO", " ", "c1ccccc1O", "not a smiles", "", "#C", "CCN", "C1CC"]
+    mols = ChemicalProperties().parse_smiles_batch(smiles)
+
+    assert len(mols) == len(smiles)
+    assert [mol is None for mol in mols] == [
+        False, True, False, True, True, True, False, True
+    ]
+    for i in (0, 2, 6):
+        assert Chem.MolToSmiles(mols[i]) == Chem.CanonSmiles(smiles[i])
+
+
+def test_parse_smiles_batch_treats_missing_values_as_none():
+    mols = ChemicalProperties().parse_smiles_batch(["CCO", math.nan, None, "CCN"])
+
+    assert [mol is None for mol in mols] == [False, True, True, False]
+    assert Chem.MolToSmiles(mols[3]) == "CCN"
+
+
+def test_parse_smiles_batch_empty():
+    assert ChemicalProperties().parse_smiles_batch([]) == []
+
+
+def _embedded(smiles):
+    mol = Chem.AddHs(Chem.MolFromSmiles(smiles))
+    AllChem.EmbedMolecule(mol, randomSeed=42)
+    return Chem.RemoveHs(mol)
+
+
+def test_calculate_similarity_aligns_embedded_pair_on_mcs():
+    mol1 = _embedded("CCO")
+    mol2 = _embedded("CCN")
+    positions1 = mol1.GetConformer().GetPositions()
+
+    similarity = ChemicalProperties().calculate_similarity(mol1, mol2)
+
+    assert similarity["mcs_size"] == 2
+    assert similarity["rmsd_after_alignment"] >= 0
+    assert similarity["shape_similarity"] == similarity["rmsd_after_alignment"]
+    # Only mol2 is moved onto mol1
+    assert (mol1.GetConformer().GetPositions() == positions1).all()
@@ -44,7 +44,9 @@ class HttpClient:
         self,
         url: str,
         params: Optional[Dict] = None,
-        verify: bool = True
+        verify: bool = True,
+        method: str = 'GET',
+        data: Optional[Dict] = None
     ) -> Optional[requests.Response]:
         """
         Make a rate-limited HTTP request with caching and progress bar.
@@ -53,12 +55,16 @@ class HttpClient:
             url: URL to request
             params: Optional query parameters
             verify: Whether to verify SSL certificates
+            method: HTTP method ('GET' or 'POST')
+            data: Optional form data sent in the request body
             
         Returns:
             Response object or None if failed
         """
         # Generate cache key
-        cache_key = f"{url}?{json.dumps(params or {})}"
+        cache_key = f"{method} {url}?{json.dumps(params or {})}"
+        if data:
+            cache_key += f" {json.dumps(data, sort_keys=True)}"
         
         # Check cache first
         if cache_key in self._cache:
@@ -81,9 +87,11 @@ class HttpClient:
             for attempt in range(max_retries):
                 retry_progress.update(1)
                 try:
-                    response = session.get(
+                    response = session.request(
+                        method,
                         url,
                         params=params,
+                        data=data,
                         timeout=10,
                         verify=verify
                     )